@@ -0,0 +1,27 @@
+"""Card name id index for keyset pagination
+
+Revision ID: b7e2c1d94a3f
+Revises: ec75df459128
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c1d94a3f'
+down_revision: Union[str, None] = 'ec75df459128'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_card_name_id', 'card', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_card_name_id', table_name='card')
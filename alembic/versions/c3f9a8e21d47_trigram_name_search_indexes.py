@@ -0,0 +1,36 @@
+"""Trigram name search indexes
+
+Revision ID: c3f9a8e21d47
+Revises: b7e2c1d94a3f
+Create Date: 2026-10-18 11:02:17.640913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a8e21d47'
+down_revision: Union[str, None] = 'b7e2c1d94a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_card_name_trgm', 'card', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_bank_name_trgm', 'bank', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bank_name_trgm', table_name='bank')
+    op.drop_index('ix_card_name_trgm', table_name='card')
@@ -0,0 +1,43 @@
+"""Card filter indexes
+
+Revision ID: d84b1e6f2c90
+Revises: c3f9a8e21d47
+Create Date: 2026-10-18 11:47:05.215930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84b1e6f2c90'
+down_revision: Union[str, None] = 'c3f9a8e21d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    active = sa.text('status = 1')
+    op.create_index('ix_card_active_name', 'card', ['name', 'id'], unique=False, postgresql_where=active)
+    op.create_index('ix_card_active_annual_fee', 'card', ['annual_fee', 'id'], unique=False, postgresql_where=active)
+    op.create_index(
+        'ix_card_active_interest_rate', 'card', ['interest_rate', 'id'], unique=False, postgresql_where=active
+    )
+    op.create_index(
+        'ix_card_active_min_credit_score', 'card', ['min_credit_score', 'id'], unique=False, postgresql_where=active
+    )
+    op.create_index(
+        'ix_card_active_bank_annual_fee', 'card', ['bank_id', 'annual_fee', 'id'], unique=False, postgresql_where=active
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_card_active_bank_annual_fee', table_name='card', postgresql_where=sa.text('status = 1'))
+    op.drop_index('ix_card_active_min_credit_score', table_name='card', postgresql_where=sa.text('status = 1'))
+    op.drop_index('ix_card_active_interest_rate', table_name='card', postgresql_where=sa.text('status = 1'))
+    op.drop_index('ix_card_active_annual_fee', table_name='card', postgresql_where=sa.text('status = 1'))
+    op.drop_index('ix_card_active_name', table_name='card', postgresql_where=sa.text('status = 1'))
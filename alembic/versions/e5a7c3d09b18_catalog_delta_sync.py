@@ -0,0 +1,47 @@
+"""Catalog delta sync
+
+Revision ID: e5a7c3d09b18
+Revises: d84b1e6f2c90
+Create Date: 2026-10-18 12:31:44.508127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3d09b18'
+down_revision: Union[str, None] = 'd84b1e6f2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('catalog_tombstone',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False, comment='Deleted entity (card/bank)'),
+    sa.Column('entity_id', sa.Integer(), nullable=False, comment='Id of the deleted row'),
+    sa.Column('created_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_time', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_catalog_tombstone_id'), 'catalog_tombstone', ['id'], unique=False)
+    op.create_index('ix_catalog_tombstone_created_time', 'catalog_tombstone', ['created_time'], unique=False)
+    op.create_index('ix_card_created_time', 'card', ['created_time'], unique=False)
+    op.create_index('ix_card_updated_time', 'card', ['updated_time'], unique=False)
+    op.create_index('ix_bank_created_time', 'bank', ['created_time'], unique=False)
+    op.create_index('ix_bank_updated_time', 'bank', ['updated_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bank_updated_time', table_name='bank')
+    op.drop_index('ix_bank_created_time', table_name='bank')
+    op.drop_index('ix_card_updated_time', table_name='card')
+    op.drop_index('ix_card_created_time', table_name='card')
+    op.drop_index('ix_catalog_tombstone_created_time', table_name='catalog_tombstone')
+    op.drop_index(op.f('ix_catalog_tombstone_id'), table_name='catalog_tombstone')
+    op.drop_table('catalog_tombstone')
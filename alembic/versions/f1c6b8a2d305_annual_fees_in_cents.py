@@ -0,0 +1,42 @@
+"""Annual fees in cents
+
+Revision ID: f1c6b8a2d305
+Revises: e5a7c3d09b18
+Create Date: 2026-10-18 16:05:12.340871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6b8a2d305'
+down_revision: Union[str, None] = 'e5a7c3d09b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The seeder stored whole dollars in a column documented as cents. Convert only while the
+    # fees still look like dollars: no card charges $1000 a year, while a table already in cents
+    # has fees of 1000 cents ($10) and more
+    op.execute(
+        """
+        UPDATE card SET annual_fee = annual_fee * 100
+        WHERE annual_fee IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM card WHERE annual_fee >= 1000)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        UPDATE card SET annual_fee = annual_fee / 100
+        WHERE annual_fee IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM card WHERE annual_fee % 100 <> 0)
+        """
+    )
@@ -2,5 +2,6 @@ from src.backend.device.model import Device
 from src.backend.user.model import User 
 from src.backend.bank.model import Bank 
 from src.backend.card.model import Card 
+from src.backend.catalog.model import CatalogTombstone
 
-__all__ = ['Device', 'User', 'Bank', 'Card']
\ No newline at end of file
+__all__ = ['Device', 'User', 'Bank', 'Card', 'CatalogTombstone']
\ No newline at end of file
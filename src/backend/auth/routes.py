@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Request
-from src.backend.auth.schemas import LoginRequest, LoginResponse, GuestLoginRequest, GuestLoginResponse, LogoutRequest, NewToken, RefreshTokenRequest
+from fastapi import APIRouter
+from src.backend.auth.schemas import LoginRequest, LoginResponse, GuestLoginRequest, GuestLoginResponse, LogoutRequest, NewToken, RefreshTokenRequest, SessionResponse
 from src.common.response.response_schema import ResponseSchemaModel, response_base
-from src.common.security.jwt import DependsJwtAuth
+from src.common.security.jwt import CurrentTokenPayload, DependsJwtAuth
 from src.database.db import DBSession
 from src.backend.auth.service import auth_service
 
@@ -23,6 +23,16 @@ async def refresh_token(db: DBSession, obj: RefreshTokenRequest) -> ResponseSche
     return response_base.success(data=data)
 
 @router.post("/logout", dependencies=[DependsJwtAuth])
-async def logout(db: DBSession,request: Request, obj: LogoutRequest) -> ResponseSchemaModel[None]:
-    await auth_service.logout(db, request, obj)
-    return response_base.success()
\ No newline at end of file
+async def logout(db: DBSession, token_payload: CurrentTokenPayload, obj: LogoutRequest) -> ResponseSchemaModel[None]:
+    await auth_service.logout(db, token_payload, obj)
+    return response_base.success()
+
+@router.post("/logout_all", dependencies=[DependsJwtAuth], description='log out of every session of the current user')
+async def logout_all(token_payload: CurrentTokenPayload) -> ResponseSchemaModel[None]:
+    await auth_service.logout_all(token_payload)
+    return response_base.success()
+
+@router.get("/sessions", dependencies=[DependsJwtAuth])
+async def sessions(token_payload: CurrentTokenPayload) -> ResponseSchemaModel[list[SessionResponse]]:
+    data = await auth_service.get_sessions(token_payload)
+    return response_base.success(data=data)
\ No newline at end of file
@@ -35,4 +35,9 @@ class LoginResponse(SchemaBase):
 
 class LogoutRequest(SchemaBase):
     refresh_token: str
-    device_id: str
\ No newline at end of file
+    device_id: str
+
+class SessionResponse(SchemaBase):
+    session_uuid: str = Field(description='Id of the login session, kept across token refreshes')
+    expire_time: datetime
+    current: bool = Field(description='Whether this is the session of the current request')
\ No newline at end of file
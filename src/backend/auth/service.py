@@ -1,18 +1,15 @@
 
-from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backend.auth.schemas import GuestLoginRequest, GuestLoginResponse, LoginRequest, LoginResponse, LogoutRequest, NewToken
+from src.backend.auth.schemas import GuestLoginRequest, GuestLoginResponse, LoginRequest, LoginResponse, LogoutRequest, NewToken, SessionResponse
 from src.backend.user.model import User
-from src.common.data_classes import RefreshToken
+from src.common.data_classes import RefreshToken, TokenPayload
 from src.common.security.password_secret import password_secret
 from src.common.security.jwt import jwt_token
 from src.backend.user.crud import user_dao
 from src.backend.device.crud import device_dao
 from src.common.exception import errors
 from src.common.log import log
-from src.core.settings import settings
-from src.database.redis import redis
 
 class AuthService:
     @staticmethod
@@ -23,8 +20,12 @@ class AuthService:
         if user.password is None:
             raise errors.AuthorizationError(msg='Incorrect email or password')
         else:
-            if not password_secret.password_verify(password, user.password):
+            valid, updated_hash = await password_secret.verify_and_update(password, user.password)
+            if not valid:
                 raise errors.AuthorizationError(msg='Incorrect email or password')
+            if updated_hash:
+                # Transparently upgrade hashes made with outdated parameters
+                await user_dao.update(db, user.id, {'password': updated_hash, 'salt': updated_hash[:29].encode()})
         if not user.status:
             raise errors.AuthorizationError(msg='Your account has been disabled. Please contact adminstrator')
         return user
@@ -79,22 +80,35 @@ class AuthService:
             elif not user.status:
                 raise errors.AuthorizationError(msg='User has been locked, please contact the system administrator')
             refresh_token_obj = RefreshToken(refresh_token=refresh_token,refresh_token_expire_time=token_info.expire_time)
-            token = await jwt_token.create_new_token(user.id, refresh_token_obj)
+            token = await jwt_token.create_new_token(user.id, refresh_token_obj, token_info.family_id)
             newToken = NewToken(access_token=token.access_token, refresh_token=token.refresh_token)
             return newToken
         except Exception as e:
             raise e
             
-    async def logout(self,db: AsyncSession,request: Request, obj: LogoutRequest) -> None:
+    async def logout(self,db: AsyncSession,token_payload: TokenPayload, obj: LogoutRequest) -> None:
         try:
-            token_payload = await jwt_token.verify_auth_user(request)
             await device_dao.delete_by_device_id(db, obj.device_id)
-            await redis.delete(f'{settings.TOKEN_REDIS_PREFIX}:{token_payload.id}:{token_payload.session_uuid}')
-            await redis.delete(f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{token_payload.id}:{obj.refresh_token}')
+            await jwt_token.revoke_token(token_payload.id, token_payload.session_uuid, token_payload.family_id)
+            await jwt_token.revoke_refresh_token(token_payload.id, obj.refresh_token)
             await db.commit()
         except Exception as e:
             await db.rollback()
             raise e
+
+    async def get_sessions(self, token_payload: TokenPayload) -> list[SessionResponse]:
+        sessions = await jwt_token.get_sessions(token_payload.id)
+        return [
+            SessionResponse(
+                session_uuid=session.session_uuid,
+                expire_time=session.expire_time,
+                current=session.session_uuid == (token_payload.family_id or token_payload.session_uuid),
+            )
+            for session in sessions
+        ]
+
+    async def logout_all(self, token_payload: TokenPayload) -> None:
+        await jwt_token.revoke_all_tokens(token_payload.id)
         
 
 auth_service: AuthService = AuthService()
\ No newline at end of file
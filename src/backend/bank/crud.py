@@ -1,12 +1,13 @@
 from typing import Any
-from sqlalchemy import Select, inspect,select, or_
+from sqlalchemy import Select, func, inspect, select, union
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy_crud_plus import CRUDPlus
 from src.backend.bank.model import Bank
 from src.backend.card.model import Card
+from src.backend.catalog.crud import CatalogCRUD
+from src.utils.search_index import escape_like
 
-class BankCRUD(CRUDPlus[Bank]):
+class BankCRUD(CatalogCRUD[Bank]):
     def _filter_input_dict(self, input_dict: dict[str, Any]) -> dict[str, Any]:
         mapper = inspect(self.model)
         valid_attrs = {attr.key for attr in mapper.attrs}
@@ -25,17 +26,23 @@ class BankCRUD(CRUDPlus[Bank]):
         result = await db.execute(stmt)
         return result.scalars().all()
     
-    async def bank_list_stmt(self, q: str) -> Select:
+    async def bank_list_stmt(self, q: str, ranked: bool = True) -> Select:
         stmt = select(self.model)
         stmt = stmt.options(selectinload(self.model.cards))
         if q:
-            search_term = f"%{q.lower()}%"
-            stmt = stmt.join(Bank.cards).where(
-                or_(
-                    Card.name.ilike(search_term), 
-                    Bank.name.ilike(search_term) 
-                )
+            search_term = f"%{escape_like(q.lower())}%"
+            # The deduplicated id set keeps one row per bank however many of its cards match, and
+            # each branch can use its own trigram index where an OR with EXISTS cannot
+            matched_ids = union(
+                select(Bank.id).where(Bank.name.ilike(search_term, escape='\\')),
+                select(Card.bank_id).where(Card.name.ilike(search_term, escape='\\')),
             )
+            stmt = stmt.where(Bank.id.in_(matched_ids))
+            if ranked:
+                best_card_similarity = (
+                    select(func.max(func.similarity(Card.name, q))).where(Card.bank_id == Bank.id).scalar_subquery()
+                )
+                stmt = stmt.order_by(func.greatest(func.similarity(Bank.name, q), best_card_similarity).desc())
         stmt = stmt.order_by(Bank.name,Bank.id)
         return stmt
 
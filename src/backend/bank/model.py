@@ -1,7 +1,7 @@
 
 
 from typing import TYPE_CHECKING
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.common.model import Base
 from src.common.model import id_key
@@ -12,6 +12,12 @@ if TYPE_CHECKING:
 
 class Bank(Base):
     __tablename__ = "bank"
+    __table_args__ = (
+        Index('ix_bank_created_time', 'created_time'),
+        Index('ix_bank_updated_time', 'updated_time'),
+        Index('ix_bank_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        {'comment': ''},
+    )
 
     id: Mapped[id_key] = mapped_column(init=False)
     name: Mapped[str] = mapped_column(String(100), unique=True, index=True, comment='Bank name')
@@ -1,11 +1,14 @@
 
-from fastapi import APIRouter, Query
+from functools import partial
+
+from fastapi import APIRouter, Query, Request
 
 from src.backend.bank.schemas import BankAddRequest,BankGetResponse,BankGetRelationResponse
 from src.common.response.response_schema import ResponseSchemaModel, response_base
 from src.database.db import DBSession
 from src.backend.bank.service import bank_service
-from src.common.pagination import DependsPagination, PageData
+from src.common.pagination import CursorPageData, DependsCursorPagination, DependsPagination, PageData
+from src.common.response.response_cache import response_cache
 
 router = APIRouter(prefix="/bank", tags=["bank"])
 
@@ -15,11 +18,19 @@ async def add_bank(db:DBSession, obj: BankAddRequest) -> ResponseSchemaModel[Ban
     return response_base.success(data=data)
 
 @router.get("/list", dependencies=[DependsPagination])
-async def list_banks(db: DBSession) -> ResponseSchemaModel[PageData[BankGetRelationResponse]]:
-    data = await bank_service.bank_list(db,'')
-    return response_base.success(data=data)
+async def list_banks(request: Request, db: DBSession) -> ResponseSchemaModel[PageData[BankGetRelationResponse]]:
+    return await response_cache.cached(
+        request, PageData[BankGetRelationResponse], partial(bank_service.bank_list, db, '')
+    )
 
 @router.get("/search", dependencies=[DependsPagination])
-async def search_bank(db: DBSession, q: str  = Query(description='search by bank or card names'),) -> ResponseSchemaModel[PageData[BankGetRelationResponse]]:
-    data = await bank_service.bank_list(db,q)
-    return response_base.success(data=data)
\ No newline at end of file
+async def search_bank(request: Request, db: DBSession, q: str  = Query(description='search by bank or card names'),) -> ResponseSchemaModel[PageData[BankGetRelationResponse]]:
+    return await response_cache.cached(
+        request, PageData[BankGetRelationResponse], partial(bank_service.bank_list, db, q)
+    )
+
+@router.get("/list/cursor", dependencies=[DependsCursorPagination])
+async def list_banks_cursor(request: Request, db: DBSession, q: str = Query('', description='search by bank or card names')) -> ResponseSchemaModel[CursorPageData[BankGetRelationResponse]]:
+    return await response_cache.cached(
+        request, CursorPageData[BankGetRelationResponse], partial(bank_service.bank_cursor_list, db, q)
+    )
@@ -2,7 +2,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.bank.schemas import BankAddRequest, BankGetRelationResponse, BankGetResponse
 from src.backend.bank.crud import bank_dao
-from src.common.pagination import PageData, paging_data
+from src.backend.bank.model import Bank
+from src.backend.catalog.search_index import catalog_search_index
+from src.common.pagination import CursorPageData, PageData, cursor_paging_data, paging_data, paging_sequence
+from src.core.settings import settings
 
 class BankService:
     async def add_bank(self, db: AsyncSession, obj: BankAddRequest) -> BankGetResponse:
@@ -16,11 +19,17 @@ class BankService:
             raise e
         
     async def bank_list(self, db: AsyncSession, q: str) -> PageData[BankGetRelationResponse]:
+        if q and settings.CATALOG_SEARCH_INDEX and await catalog_search_index.sync():
+            return paging_sequence(catalog_search_index.banks.search(q), catalog_search_index.hydrate_banks)
         stmt = await bank_dao.bank_list_stmt(q)
         try:
-            paged_data = await paging_data(db, stmt)
+            paged_data = await paging_data(db, stmt, count='cached' if q else 'estimate')
             return paged_data
         except Exception as e:
             raise e
 
+    async def bank_cursor_list(self, db: AsyncSession, q: str) -> CursorPageData[BankGetRelationResponse]:
+        stmt = await bank_dao.bank_list_stmt(q, ranked=False)
+        return await cursor_paging_data(db, stmt, Bank.name, Bank.id)
+
 bank_service: BankService = BankService()
\ No newline at end of file
@@ -1,12 +1,48 @@
-from typing import Any
-from sqlalchemy import Select, inspect, or_, select
+from typing import Any, Sequence
+from sqlalchemy import ColumnElement, Select, and_, func, inspect, select, union
 from sqlalchemy.orm import selectinload
-from sqlalchemy_crud_plus import CRUDPlus
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.backend.bank.model import Bank
 from src.backend.card.model import Card
+from src.backend.card.schemas import CardFilterParams
+from src.backend.catalog.crud import CatalogCRUD
+from src.common.exception import errors
+from src.utils.search_index import escape_like
 
-class CardCRUD(CRUDPlus[Card]):
+# Facet buckets as (key, lower bound, upper bound), bounds inclusive and None when open.
+# Fees are stored in cents, cards without a stored value are counted as 'unknown'
+ANNUAL_FEE_BUCKETS = (
+    ('none', 0, 0),
+    ('up_to_100', 1, 10000),
+    ('100_to_300', 10001, 30000),
+    ('over_300', 30001, None),
+)
+CREDIT_SCORE_BANDS = (
+    ('poor', None, 579),
+    ('fair', 580, 669),
+    ('good', 670, 739),
+    ('very_good', 740, 799),
+    ('excellent', 800, None),
+)
+SORT_COLUMNS = {
+    'name': Card.name,
+    'annual_fee': Card.annual_fee,
+    'interest_rate': Card.interest_rate,
+    'min_credit_score': Card.min_credit_score,
+    'is_featured': Card.is_featured,
+}
+
+
+def _between(column, lower: int | None, upper: int | None) -> ColumnElement[bool]:
+    conditions = []
+    if lower is not None:
+        conditions.append(column >= lower)
+    if upper is not None:
+        conditions.append(column <= upper)
+    return and_(*conditions)
+
+
+class CardCRUD(CatalogCRUD[Card]):
     def _filter_input_dict(self, input_dict: dict[str, Any]) -> dict[str, Any]:
         mapper = inspect(self.model)
         valid_attrs = {attr.key for attr in mapper.attrs}
@@ -21,18 +57,96 @@ class CardCRUD(CRUDPlus[Card]):
         card = self.model(**filtered_obj)
         db.add(card)
 
-    async def card_list_stmt(self, q: str) -> Select:
+    async def get_by_name_prefix(self, db: AsyncSession, prefix: str, limit: int) -> Sequence[Card]:
+        stmt = (
+            select(self.model)
+            .where(self.model.name.ilike(f"{escape_like(prefix)}%", escape='\\'))
+            .order_by(self.model.name)
+            .limit(limit)
+        )
+        result = await db.scalars(stmt)
+        return result.all()
+
+    async def card_list_stmt(self, q: str, ranked: bool = True) -> Select:
         stmt = select(self.model)
         stmt = stmt.options(selectinload(self.model.bank))
         if q:
-            search_term = f"%{q.lower()}%"
-            stmt = stmt.join(Card.bank).where(
-                or_(
-                    Card.name.ilike(search_term), 
-                    Bank.name.ilike(search_term) 
-                )
+            search_term = f"%{escape_like(q.lower())}%"
+            # Each branch can use its own trigram index, an OR across the join cannot
+            matched_ids = union(
+                select(Card.id).where(Card.name.ilike(search_term, escape='\\')),
+                select(Card.id).join(Card.bank).where(Bank.name.ilike(search_term, escape='\\')),
             )
+            stmt = stmt.where(Card.id.in_(matched_ids))
+            if ranked:
+                stmt = stmt.join(Card.bank).order_by(
+                    func.greatest(func.similarity(Card.name, q), func.similarity(Bank.name, q)).desc()
+                )
         stmt = stmt.order_by(Card.name, Card.id)
         return stmt
 
+    @staticmethod
+    def _filter_conditions(filters: CardFilterParams) -> list[ColumnElement[bool]]:
+        conditions = [Card.status == 1]
+        if filters.bank_id is not None:
+            conditions.append(Card.bank_id == filters.bank_id)
+        if filters.min_annual_fee is not None or filters.max_annual_fee is not None:
+            conditions.append(_between(Card.annual_fee, filters.min_annual_fee, filters.max_annual_fee))
+        if filters.max_interest_rate is not None:
+            conditions.append(Card.interest_rate <= filters.max_interest_rate)
+        if filters.credit_score is not None:
+            conditions.append(Card.min_credit_score <= filters.credit_score)
+        if filters.is_featured is not None:
+            conditions.append(Card.is_featured == int(filters.is_featured))
+        return conditions
+
+    @staticmethod
+    def _sort_order(sort: str) -> list:
+        # Plain ASC/DESC with the id tiebreaker in the direction of the first key, so a single key
+        # sort is an index scan of its (column, id) index, backwards when descending
+        order_by = []
+        for key in filter(None, (key.strip() for key in sort.split(','))):
+            column = SORT_COLUMNS.get(key.lstrip('-'))
+            if column is None:
+                raise errors.RequestError(msg=f'Unknown sort key: {key}')
+            order_by.append(column.desc() if key.startswith('-') else column.asc())
+        order_by.append(Card.id.desc() if sort.strip().startswith('-') else Card.id.asc())
+        return order_by
+
+    async def card_filter_stmt(self, filters: CardFilterParams) -> Select:
+        stmt = select(self.model).options(selectinload(self.model.bank))
+        stmt = stmt.where(*self._filter_conditions(filters))
+        return stmt.order_by(*self._sort_order(filters.sort))
+
+    async def card_facets(self, db: AsyncSession, filters: CardFilterParams) -> dict[str, list[tuple[str, int]]]:
+        """
+        Facet counts of the filtered cards, all taken by a single aggregate query
+
+        :param db: Database session
+        :param filters: Card filters
+        :return:
+        """
+        facets = {
+            'annual_fee': [
+                *((key, _between(Card.annual_fee, lower, upper)) for key, lower, upper in ANNUAL_FEE_BUCKETS),
+                ('unknown', Card.annual_fee.is_(None)),
+            ],
+            'min_credit_score': [
+                *((key, _between(Card.min_credit_score, lower, upper)) for key, lower, upper in CREDIT_SCORE_BANDS),
+                ('unknown', Card.min_credit_score.is_(None)),
+            ],
+            'is_featured': [('featured', Card.is_featured == 1), ('regular', Card.is_featured == 0)],
+        }
+        stmt = select(
+            *(
+                func.count().filter(condition).label(f'{facet}__{key}')
+                for facet, buckets in facets.items()
+                for key, condition in buckets
+            )
+        ).where(*self._filter_conditions(filters))
+        counts = (await db.execute(stmt)).one()._mapping
+        return {
+            facet: [(key, counts[f'{facet}__{key}']) for key, _ in buckets] for facet, buckets in facets.items()
+        }
+
 card_dao: CardCRUD = CardCRUD(Card)
\ No newline at end of file
@@ -1,6 +1,6 @@
 
 from typing import TYPE_CHECKING
-from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import INTEGER
 from src.common.model import Base, id_key
@@ -14,6 +14,20 @@ if TYPE_CHECKING:
 
 class Card(Base):
     __tablename__ = "card"
+    # (name, id) backs keyset pagination of the catalog, the trigram index backs name search
+    # the partial indexes back filtering and sorting of active cards and the time indexes the delta sync
+    __table_args__ = (
+        Index('ix_card_created_time', 'created_time'),
+        Index('ix_card_updated_time', 'updated_time'),
+        Index('ix_card_name_id', 'name', 'id'),
+        Index('ix_card_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_card_active_name', 'name', 'id', postgresql_where=text('status = 1')),
+        Index('ix_card_active_annual_fee', 'annual_fee', 'id', postgresql_where=text('status = 1')),
+        Index('ix_card_active_interest_rate', 'interest_rate', 'id', postgresql_where=text('status = 1')),
+        Index('ix_card_active_min_credit_score', 'min_credit_score', 'id', postgresql_where=text('status = 1')),
+        Index('ix_card_active_bank_annual_fee', 'bank_id', 'annual_fee', 'id', postgresql_where=text('status = 1')),
+        {'comment': ''},
+    )
 
     id: Mapped[id_key] = mapped_column(init=False)
     bank_id: Mapped[int] = mapped_column(ForeignKey('bank.id'), index=True, comment='Reference to bank')
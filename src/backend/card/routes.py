@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Query
+from functools import partial
+from typing import Annotated
 
-from src.backend.card.schemas import CardAddRequest, CardGetRelationResponse, CardGetResponse
-from src.common.pagination import DependsPagination, PageData
+from fastapi import APIRouter, Query, Request
+
+from src.backend.card.schemas import (
+    CardAddRequest,
+    CardFilterParams,
+    CardFilterResponse,
+    CardGetRelationResponse,
+    CardGetResponse,
+    CardSuggestion,
+)
+from src.common.pagination import CursorPageData, DependsCursorPagination, DependsPagination, PageData
+from src.common.response.response_cache import response_cache
 from src.common.response.response_schema import ResponseSchemaModel, response_base
+from src.core.settings import settings
 from src.database.db import DBSession
 from src.backend.card.service import card_service
 
@@ -14,11 +26,28 @@ async def add_card(db:DBSession, obj: CardAddRequest) -> ResponseSchemaModel[Car
     return
 
 @router.get("/list", dependencies=[DependsPagination])
-async def list_cards(db: DBSession) -> ResponseSchemaModel[PageData[CardGetRelationResponse]]:
-    data = await card_service.card_list(db, '')
-    return response_base.success(data=data)
+async def list_cards(request: Request, db: DBSession) -> ResponseSchemaModel[PageData[CardGetRelationResponse]]:
+    return await response_cache.cached(
+        request, PageData[CardGetRelationResponse], partial(card_service.card_list, db, '')
+    )
 
 @router.get("/search", dependencies=[DependsPagination])
-async def search_cards(db: DBSession, q: str  = Query(description='search by bank or card names'),) -> ResponseSchemaModel[PageData[CardGetRelationResponse]]:
-    data = await card_service.card_list(db,q)
-    return response_base.success(data=data)
\ No newline at end of file
+async def search_cards(request: Request, db: DBSession, q: str  = Query(description='search by bank or card names'),) -> ResponseSchemaModel[PageData[CardGetRelationResponse]]:
+    return await response_cache.cached(
+        request, PageData[CardGetRelationResponse], partial(card_service.card_list, db, q)
+    )
+
+@router.get("/filter", dependencies=[DependsPagination])
+async def filter_cards(request: Request, db: DBSession, filters: Annotated[CardFilterParams, Query()]) -> ResponseSchemaModel[CardFilterResponse]:
+    return await response_cache.cached(request, CardFilterResponse, partial(card_service.card_filter, db, filters))
+
+@router.get("/list/cursor", dependencies=[DependsCursorPagination])
+async def list_cards_cursor(request: Request, db: DBSession, q: str = Query('', description='search by bank or card names')) -> ResponseSchemaModel[CursorPageData[CardGetRelationResponse]]:
+    return await response_cache.cached(
+        request, CursorPageData[CardGetRelationResponse], partial(card_service.card_cursor_list, db, q)
+    )
+
+@router.get("/suggest")
+async def suggest_cards(db: DBSession, q: str = Query(description='partially typed card or bank name'), limit: int = Query(settings.CATALOG_SUGGEST_LIMIT, gt=0, le=20)) -> ResponseSchemaModel[list[CardSuggestion]]:
+    data = await card_service.suggest(db, q, limit)
+    return response_base.success(data=data)
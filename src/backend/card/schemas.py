@@ -1,5 +1,10 @@
 
 
+from typing import Literal
+
+from pydantic import Field
+
+from src.common.pagination import PageData
 from src.common.schema import SchemaBase
     
 
@@ -39,3 +44,34 @@ class CardGetRelationResponse(SchemaBase):
     min_credit_score: int 
     bank: BankRelation
 
+class CardSuggestion(SchemaBase):
+    type: Literal['card', 'bank']
+    id: int
+    name: str
+
+class CardFilterParams(SchemaBase):
+    bank_id: int | None = Field(None, description='Only cards of this bank')
+    min_annual_fee: int | None = Field(None, ge=0, description='Minimum annual fee in cents')
+    max_annual_fee: int | None = Field(None, ge=0, description='Maximum annual fee in cents')
+    max_interest_rate: int | None = Field(None, ge=0, description='Maximum APR in basis points')
+    credit_score: int | None = Field(None, ge=300, le=850, description='Only cards recommended for this credit score')
+    is_featured: bool | None = Field(None, description='Only featured or only regular cards')
+    sort: str = Field(
+        'name',
+        description='Comma separated sort keys among name, annual_fee, interest_rate, min_credit_score and '
+        'is_featured, prefixed with - for descending order. Unknown values sort after known ones in ascending '
+        'order and before them in descending order',
+    )
+
+class FacetBucket(SchemaBase):
+    key: str
+    count: int
+
+class CardFacets(SchemaBase):
+    annual_fee: list[FacetBucket]
+    min_credit_score: list[FacetBucket]
+    is_featured: list[FacetBucket]
+
+class CardFilterResponse(SchemaBase):
+    cards: PageData[CardGetRelationResponse]
+    facets: CardFacets
@@ -1,18 +1,61 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.backend.card.schemas import CardGetRelationResponse
-from src.common.pagination import PageData, paging_data
+from src.backend.card.schemas import (
+    CardFacets,
+    CardFilterParams,
+    CardFilterResponse,
+    CardGetRelationResponse,
+    CardSuggestion,
+    FacetBucket,
+)
+from src.backend.catalog.search_index import catalog_search_index
+from src.common.pagination import CursorPageData, PageData, cursor_paging_data, paging_data, paging_sequence
 from src.backend.card.crud import card_dao
+from src.backend.card.model import Card
+from src.core.settings import settings
 
 
 class CardService:
 
     async def card_list(self, db: AsyncSession, q: str) -> PageData[CardGetRelationResponse]:
+        if q and settings.CATALOG_SEARCH_INDEX and await catalog_search_index.sync():
+            return paging_sequence(catalog_search_index.cards.search(q), catalog_search_index.hydrate_cards)
         stmt = await card_dao.card_list_stmt(q)
         try:
-            paged_data = await paging_data(db, stmt)
+            paged_data = await paging_data(db, stmt, count='cached' if q else 'estimate')
             return paged_data
         except Exception as e:
             raise e
-        
+
+    async def card_cursor_list(self, db: AsyncSession, q: str) -> CursorPageData[CardGetRelationResponse]:
+        stmt = await card_dao.card_list_stmt(q, ranked=False)
+        return await cursor_paging_data(db, stmt, Card.name, Card.id)
+
+    async def card_filter(self, db: AsyncSession, filters: CardFilterParams) -> CardFilterResponse:
+        stmt = await card_dao.card_filter_stmt(filters)
+        cards = await paging_data(db, stmt, count='cached')
+        facets = await card_dao.card_facets(db, filters)
+        return CardFilterResponse(
+            cards=PageData[CardGetRelationResponse].model_validate(cards, from_attributes=True),
+            facets=CardFacets(
+                **{
+                    facet: [FacetBucket(key=key, count=count) for key, count in buckets]
+                    for facet, buckets in facets.items()
+                }
+            ),
+        )
+
+    async def suggest(self, db: AsyncSession, q: str, limit: int) -> list[CardSuggestion]:
+        q = q.strip()
+        if not q:
+            return []
+        if settings.CATALOG_SEARCH_INDEX and await catalog_search_index.sync():
+            return [
+                CardSuggestion(type=kind, id=item_id, name=name)
+                for (kind, item_id), name in catalog_search_index.suggestions.suggest(q, limit)
+            ]
+        # Without the index only exact card name prefixes can be suggested
+        cards = await card_dao.get_by_name_prefix(db, q, limit)
+        return [CardSuggestion(type='card', id=card.id, name=card.name) for card in cards]
+
 card_service: CardService = CardService()
\ No newline at end of file
@@ -0,0 +1,113 @@
+from typing import Any, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnExpressionArgument, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy_crud_plus import CRUDPlus
+from sqlalchemy_crud_plus.errors import MultipleResultsError
+from sqlalchemy_crud_plus.types import Model
+from sqlalchemy_crud_plus.utils import parse_filters
+
+from src.backend.catalog.model import CatalogTombstone
+from src.common.response.response_cache import response_cache
+from src.utils.timezone import timezone
+
+
+class CatalogCRUD(CRUDPlus[Model]):
+    """
+    Base DAO of the catalog tables
+
+    Bulk update and delete statements bypass the session's flush and the mapper events, so
+    each of them flags the session itself for the catalog version bump on commit, and deletes
+    record their tombstones in the same transaction
+    """
+
+    async def _delete_rows(self, session: AsyncSession, *whereclause: ColumnExpressionArgument[bool]) -> int:
+        """
+        Delete the matching rows and record a tombstone for each of them
+
+        :param session: Database session
+        :param whereclause: Rows to delete
+        :return: Number of deleted rows
+        """
+        ids = (await session.scalars(delete(self.model).where(*whereclause).returning(self.model.id))).all()
+        if ids:
+            now = timezone.now()
+            await session.execute(
+                insert(CatalogTombstone.__table__),
+                [{'entity': self.model.__tablename__, 'entity_id': row_id, 'created_time': now} for row_id in ids],
+            )
+        response_cache.mark_changed(session)
+        return len(ids)
+
+    async def update_model(
+        self,
+        session: AsyncSession,
+        pk: Any | Sequence[Any],
+        obj: BaseModel | dict[str, Any],
+        flush: bool = False,
+        commit: bool = False,
+        **kwargs,
+    ) -> int:
+        response_cache.mark_changed(session)
+        return await super().update_model(session, pk, obj, flush=flush, commit=commit, **kwargs)
+
+    async def update_model_by_column(
+        self,
+        session: AsyncSession,
+        obj: BaseModel | dict[str, Any],
+        allow_multiple: bool = False,
+        flush: bool = False,
+        commit: bool = False,
+        **kwargs,
+    ) -> int:
+        response_cache.mark_changed(session)
+        return await super().update_model_by_column(
+            session, obj, allow_multiple=allow_multiple, flush=flush, commit=commit, **kwargs
+        )
+
+    async def delete_model(
+        self,
+        session: AsyncSession,
+        pk: Any | Sequence[Any],
+        flush: bool = False,
+        commit: bool = False,
+    ) -> int:
+        count = await self._delete_rows(session, *self._get_pk_filter(pk))
+        if flush:
+            await session.flush()
+        if commit:
+            await session.commit()
+        return count
+
+    async def delete_model_by_column(
+        self,
+        session: AsyncSession,
+        allow_multiple: bool = False,
+        logical_deletion: bool = False,
+        deleted_flag_column: str = 'del_flag',
+        flush: bool = False,
+        commit: bool = False,
+        **kwargs,
+    ) -> int:
+        if logical_deletion:
+            response_cache.mark_changed(session)
+            return await super().delete_model_by_column(
+                session,
+                allow_multiple=allow_multiple,
+                logical_deletion=logical_deletion,
+                deleted_flag_column=deleted_flag_column,
+                flush=flush,
+                commit=commit,
+                **kwargs,
+            )
+        filters = parse_filters(self.model, **kwargs)
+        total_count = await self.count(session, *filters)
+        if not allow_multiple and total_count > 1:
+            raise MultipleResultsError(f'Only one record is expected to be delete, found {total_count} records.')
+        count = await self._delete_rows(session, *filters)
+        if flush:
+            await session.flush()
+        if commit:
+            await session.commit()
+        return count
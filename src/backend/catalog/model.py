@@ -0,0 +1,42 @@
+from typing import Any
+
+from sqlalchemy import Index, String, event, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, Mapper, Session, mapped_column
+
+from src.backend.bank.model import Bank
+from src.backend.card.model import Card
+from src.common.model import Base, id_key
+from src.common.response.response_cache import response_cache
+from src.utils.timezone import timezone
+
+
+class CatalogTombstone(Base):
+    __tablename__ = "catalog_tombstone"
+    # created_time is the deletion time, the delta sync reads tombstones by it
+    __table_args__ = (
+        Index('ix_catalog_tombstone_created_time', 'created_time'),
+        {'comment': ''},
+    )
+
+    id: Mapped[id_key] = mapped_column(init=False)
+    entity: Mapped[str] = mapped_column(String(20), comment='Deleted entity (card/bank)')
+    entity_id: Mapped[int] = mapped_column(comment='Id of the deleted row')
+
+
+@event.listens_for(Card, 'after_delete')
+@event.listens_for(Bank, 'after_delete')
+def _record_tombstone(mapper: Mapper, connection: Connection, target: Any) -> None:
+    # Rows deleted through the session, CatalogCRUD records the tombstones of its bulk deletes
+    connection.execute(
+        insert(CatalogTombstone.__table__).values(
+            entity=mapper.local_table.name, entity_id=target.id, created_time=timezone.now()
+        )
+    )
+
+
+@event.listens_for(Session, 'before_flush')
+def _mark_catalog_changed(session: Session, flush_context: Any, instances: Any) -> None:
+    # Covers catalog rows added, edited or deleted through the session, including cascades
+    if any(isinstance(obj, (Card, Bank)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        response_cache.mark_changed(session)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from src.backend.catalog.service import catalog_service
+
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+@router.get("/changes", description='NDJSON stream of bank and card upserts and deletes since a catalog version')
+async def catalog_changes(since: int = Query(0, ge=0, description='catalog version of the last sync, 0 for a full snapshot')) -> StreamingResponse:
+    stream = await catalog_service.changes(since)
+    return StreamingResponse(stream, media_type='application/x-ndjson', headers={'Cache-Control': 'no-cache'})
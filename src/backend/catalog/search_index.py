@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+from datetime import datetime, timedelta
+
+from pydantic import ValidationError
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.backend.bank.model import Bank
+from src.backend.bank.schemas import BankGetRelationResponse
+from src.backend.card.model import Card
+from src.backend.card.schemas import CardGetRelationResponse
+from src.common.log import log
+from src.common.response.response_cache import response_cache
+from src.core.settings import settings
+from src.database.db import db
+from src.utils.search_index import SearchIndex
+from src.utils.suggest_index import SuggestIndex
+
+
+def _changed_since(model: type[Card] | type[Bank], since: datetime):
+    return or_(model.created_time >= since, model.updated_time >= since)
+
+
+class CatalogSearchIndex:
+    """
+    Per-worker in-memory search index of the bank and card catalog
+
+    Built once at startup, then refreshed incrementally from created_time/updated_time
+    whenever the catalog version changes, so searches, suggestions and their responses
+    are served from memory.
+    """
+
+    def __init__(self) -> None:
+        self.cards = SearchIndex(('name', 'bank'))
+        self.banks = SearchIndex(('name', 'cards'))
+        self.suggestions = SuggestIndex(max_distance=settings.CATALOG_SUGGEST_MAX_DISTANCE)
+        self.card_rows: dict[int, CardGetRelationResponse] = {}
+        self.bank_rows: dict[int, BankGetRelationResponse] = {}
+        self.version: int | None = None
+        self._synced_at: datetime | None = None
+        self._checked_at = -float('inf')
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.version is not None
+
+    async def sync(self) -> bool:
+        """
+        Bring the index up to the current catalog version
+
+        :return: Whether the index can serve searches
+        """
+        try:
+            # Cached responses already read the version they are built for, other requests check
+            # it at most once per interval
+            version = response_cache.building_version()
+            if version is None:
+                if time.monotonic() - self._checked_at < settings.CATALOG_SEARCH_VERSION_CHECK_SECONDS:
+                    return self.ready
+                version = await response_cache.version()
+                self._checked_at = time.monotonic()
+            if self.ready and version <= self.version:
+                return True
+            async with self._lock:
+                if not self.ready or version > self.version:
+                    async with db.db_session() as session:
+                        synced_at = await session.scalar(select(func.now()))
+                        if self._synced_at is None:
+                            await self._build(session)
+                        else:
+                            since = self._synced_at - timedelta(seconds=settings.CATALOG_SEARCH_SYNC_OVERLAP_SECONDS)
+                            await self._refresh(session, since)
+                    self._synced_at = synced_at
+                    self.version = version
+        except Exception as e:
+            log.warning(f'Catalog search index sync failed: {e}')
+        return self.ready
+
+    async def _build(self, session: AsyncSession) -> None:
+        self.cards = SearchIndex(self.cards.fields)
+        self.banks = SearchIndex(self.banks.fields)
+        self.suggestions = SuggestIndex(max_distance=settings.CATALOG_SUGGEST_MAX_DISTANCE)
+        self.card_rows = {}
+        self.bank_rows = {}
+        for card in await session.scalars(select(Card).options(selectinload(Card.bank))):
+            self._index_card(card)
+        for bank in await session.scalars(select(Bank).options(selectinload(Bank.cards))):
+            self._index_bank(bank)
+        log.info(f'Catalog search index built with {len(self.card_rows)} cards and {len(self.bank_rows)} banks')
+
+    async def _refresh(self, session: AsyncSession, since: datetime) -> None:
+        card_ids = set(await session.scalars(select(Card.id).where(_changed_since(Card, since))))
+        bank_ids = set(await session.scalars(select(Bank.id).where(_changed_since(Bank, since))))
+        removed_card_ids = self.card_rows.keys() - set(await session.scalars(select(Card.id)))
+        removed_bank_ids = self.bank_rows.keys() - set(await session.scalars(select(Bank.id)))
+
+        # Bank documents carry their card names and card documents their bank name
+        bank_ids |= {self.card_rows[card_id].bank_id for card_id in card_ids | removed_card_ids if card_id in self.card_rows}
+        bank_ids |= set(await session.scalars(select(Card.bank_id).where(Card.id.in_(card_ids))))
+        card_ids |= set(await session.scalars(select(Card.id).where(Card.bank_id.in_(bank_ids))))
+
+        for card_id in removed_card_ids:
+            self._remove_card(card_id)
+        for bank_id in removed_bank_ids:
+            self._remove_bank(bank_id)
+        stmt = select(Card).options(selectinload(Card.bank)).where(Card.id.in_(card_ids))
+        for card in await session.scalars(stmt):
+            self._index_card(card)
+        stmt = select(Bank).options(selectinload(Bank.cards)).where(Bank.id.in_(bank_ids - removed_bank_ids))
+        for bank in await session.scalars(stmt):
+            self._index_bank(bank)
+
+    def _index_card(self, card: Card) -> None:
+        try:
+            row = CardGetRelationResponse.model_validate(card)
+        except ValidationError as e:
+            log.warning(f'Card {card.id} left out of the search index: {e}')
+            self._remove_card(card.id)
+            return
+        self.card_rows[card.id] = row
+        self.cards.add(card.id, (card.name, card.id), name=card.name, bank=card.bank.name)
+        self.suggestions.add(('card', card.id), card.name)
+
+    def _remove_card(self, card_id: int) -> None:
+        self.cards.remove(card_id)
+        self.suggestions.remove(('card', card_id))
+        self.card_rows.pop(card_id, None)
+
+    def _index_bank(self, bank: Bank) -> None:
+        try:
+            row = BankGetRelationResponse.model_validate(bank)
+        except ValidationError as e:
+            log.warning(f'Bank {bank.id} left out of the search index: {e}')
+            self._remove_bank(bank.id)
+            return
+        self.bank_rows[bank.id] = row
+        self.banks.add(bank.id, (bank.name, bank.id), name=bank.name, cards=[card.name for card in bank.cards])
+        self.suggestions.add(('bank', bank.id), bank.name)
+
+    def _remove_bank(self, bank_id: int) -> None:
+        self.banks.remove(bank_id)
+        self.suggestions.remove(('bank', bank_id))
+        self.bank_rows.pop(bank_id, None)
+
+    def hydrate_cards(self, card_ids: list[int]) -> list[CardGetRelationResponse]:
+        return [self.card_rows[card_id] for card_id in card_ids]
+
+    def hydrate_banks(self, bank_ids: list[int]) -> list[BankGetRelationResponse]:
+        return [self.bank_rows[bank_id] for bank_id in bank_ids]
+
+
+catalog_search_index: CatalogSearchIndex = CatalogSearchIndex()
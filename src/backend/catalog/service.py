@@ -0,0 +1,113 @@
+import asyncio
+
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator
+
+from msgspec import json
+from pydantic import ValidationError
+from sqlalchemy import delete, or_, select
+
+from src.backend.bank.model import Bank
+from src.backend.bank.schemas import BankGetResponse
+from src.backend.card.model import Card
+from src.backend.card.schemas import CardGetResponse
+from src.backend.catalog.model import CatalogTombstone
+from src.common.log import log
+from src.common.response.response_cache import response_cache
+from src.core.settings import settings
+from src.database.db import db
+from src.utils.timezone import timezone
+
+_STREAM_BATCH_SIZE = 500
+
+
+def _line(record: dict[str, Any]) -> bytes:
+    return json.encode(record) + b'\n'
+
+
+class CatalogService:
+    def __init__(self) -> None:
+        self._prune_task: asyncio.Task | None = None
+
+    async def changes(self, since: int) -> AsyncIterator[bytes]:
+        """
+        NDJSON stream of the bank and card changes since a catalog version
+
+        The first line carries the current version the client passes as ``since`` next time.
+        When ``since`` is unknown or older than the retained versions the stream is a full
+        snapshot, flagged so the client replaces its copy instead of merging into it.
+
+        :param since: Catalog version the client last synced to, 0 for a full snapshot
+        :return:
+        """
+        version = await response_cache.version()
+        changed_since = await response_cache.version_time(since) if 0 < since <= version else None
+        if changed_since is not None:
+            # Rows written by transactions still open when the client synced carry an earlier time
+            changed_since -= timedelta(seconds=settings.CATALOG_CHANGES_OVERLAP_SECONDS)
+        return self._stream_changes(version, changed_since)
+
+    @staticmethod
+    async def _stream_changes(version: int, changed_since: datetime | None) -> AsyncIterator[bytes]:
+        yield _line({'op': 'meta', 'version': version, 'full': changed_since is None})
+        # The request's session is closed before a streamed body is sent
+        async with db.db_session() as session:
+            for entity, model, schema in (('bank', Bank, BankGetResponse), ('card', Card, CardGetResponse)):
+                stmt = select(model).order_by(model.id).execution_options(yield_per=_STREAM_BATCH_SIZE)
+                if changed_since is not None:
+                    stmt = stmt.where(or_(model.created_time >= changed_since, model.updated_time >= changed_since))
+                async for row in await session.stream_scalars(stmt):
+                    try:
+                        data = schema.model_validate(row).model_dump(mode='json')
+                    except ValidationError as e:
+                        log.warning(f'{entity.capitalize()} {row.id} left out of the catalog changes: {e}')
+                        continue
+                    yield _line({'op': 'upsert', 'entity': entity, 'data': data})
+
+            if changed_since is not None:
+                stmt = (
+                    select(CatalogTombstone.entity, CatalogTombstone.entity_id)
+                    .where(CatalogTombstone.created_time >= changed_since)
+                    .order_by(CatalogTombstone.id)
+                    .execution_options(yield_per=_STREAM_BATCH_SIZE)
+                )
+                async for entity, entity_id in await session.stream(stmt):
+                    yield _line({'op': 'delete', 'entity': entity, 'id': entity_id})
+
+    @staticmethod
+    async def prune_tombstones() -> int:
+        """
+        Delete the tombstones no client can still sync from, since older versions get a full snapshot
+
+        :return: Number of deleted tombstones
+        """
+        cutoff = timezone.now() - timedelta(
+            seconds=settings.CATALOG_CHANGES_RETENTION_SECONDS + settings.CATALOG_CHANGES_OVERLAP_SECONDS
+        )
+        async with db.db_session.begin() as session:
+            result = await session.execute(delete(CatalogTombstone).where(CatalogTombstone.created_time < cutoff))
+        return result.rowcount
+
+    async def _prune_tombstones_periodically(self) -> None:
+        while True:
+            try:
+                await self.prune_tombstones()
+            except Exception as e:
+                log.warning(f'Catalog tombstone pruning error: {e}')
+            await asyncio.sleep(settings.CATALOG_TOMBSTONE_PRUNE_SECONDS)
+
+    def start_tombstone_pruning(self) -> None:
+        if self._prune_task is None:
+            self._prune_task = asyncio.create_task(self._prune_tombstones_periodically())
+
+    async def stop_tombstone_pruning(self) -> None:
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            try:
+                await self._prune_task
+            except asyncio.CancelledError:
+                pass
+            self._prune_task = None
+
+
+catalog_service: CatalogService = CatalogService()
@@ -1,18 +1,16 @@
-from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.device.schemas import DeviceAddRequest
+from src.common.data_classes import TokenPayload
 from src.common.exception import errors
 from src.backend.device.crud import device_dao 
-from src.common.security.jwt import jwt_token
 from src.backend.user.crud import user_dao
 
 class DeviceService:
-    async def add_device(self, request: Request, db: AsyncSession, obj: DeviceAddRequest):
+    async def add_device(self, token_payload: TokenPayload, db: AsyncSession, obj: DeviceAddRequest):
         try:
 
-            # Check auth status and get the user with relation to device 
-            token_payload = await jwt_token.verify_auth_user(request)
+            # Get the authenticated user with relation to device 
             user = await user_dao.get_by_id_device_relation(db, token_payload.id)
             if not user:
                 raise errors.ServerError(msg='Unable to add device')
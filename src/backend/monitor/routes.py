@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+
+from src.common.response.response_cache import response_cache
+from src.common.response.response_schema import ResponseModel, response_base
+from src.common.security.jwt import DependsJwtAuth, jwt_token
+from src.common.security.password_secret import password_secret
+from src.core.settings import settings
+from src.utils.request_context import request_context_stats
+from src.utils.request_parser import request_parser
+
+router = APIRouter(
+    prefix="/monitor", tags=["monitor"], dependencies=[DependsJwtAuth] if settings.MONITOR_AUTH_REQUIRED else []
+)
+
+
+@router.get("/cache", description='in-process cache statistics of this worker')
+async def cache_stats() -> ResponseModel:
+    data = {
+        'ip_location': request_parser.ip_cache.stats(),
+        'user_agent': request_parser.ua_cache.stats(),
+        'verified_token': jwt_token.verified_cache_stats(),
+    }
+    return response_base.success(data=data)
+
+
+@router.get("/response_cache", description='catalog response cache hit ratio and bytes served on this worker')
+async def response_cache_stats() -> ResponseModel:
+    return response_base.success(data=response_cache.stats())
+
+
+@router.get("/password_hash", description='password hash pool queue depth of this worker')
+async def password_hash() -> ResponseModel:
+    return response_base.success(data=password_secret.stats())
+
+
+@router.get("/request_context", description='how often lazy request enrichment was needed on this worker')
+async def request_context() -> ResponseModel:
+    return response_base.success(data=request_context_stats)
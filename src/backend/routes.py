@@ -3,8 +3,10 @@ from src.backend.auth.routes import router as auth_router
 from src.backend.user.routes import router as user_router
 from src.backend.bank.routes import router as bank_router
 from src.backend.card.routes import router as card_router
+from src.backend.catalog.routes import router as catalog_router
 from src.backend.device.routes import router as device_router
 from src.backend.seeder.routes import router as seeder_router
+from src.backend.monitor.routes import router as monitor_router
 from src.backend.root.root import router as root_router
 from src.core.settings import settings
 
@@ -13,6 +15,8 @@ router.include_router(auth_router)
 router.include_router(user_router)
 router.include_router(bank_router)
 router.include_router(card_router)
+router.include_router(catalog_router)
 router.include_router(device_router)
 router.include_router(seeder_router)
+router.include_router(monitor_router)
 router.include_router(root_router)
\ No newline at end of file
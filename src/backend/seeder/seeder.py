@@ -19,7 +19,7 @@ class Seeder:
                 {
                     "name": "Chase Sapphire Preferred",
                     "description": "Travel rewards card with generous sign-up bonus",
-                    "annual_fee": 95,
+                    "annual_fee": 9500,
                     "reward_desc": "2x on travel/dining, 1x on all else",
                     "interest_rate": 2149,
                     "min_credit_score": 700
@@ -50,7 +50,7 @@ class Seeder:
                 {
                     "name": "Amex Platinum",
                     "description": "Premium travel card with luxury benefits",
-                    "annual_fee": 695,
+                    "annual_fee": 69500,
                     "reward_desc": "5x on flights, 5x on prepaid hotels, 1x on other purchases",
                     "interest_rate": 2199,
                     "min_credit_score": 720
@@ -58,7 +58,7 @@ class Seeder:
                 {
                     "name": "Amex Gold",
                     "description": "Rewards card focused on dining and groceries",
-                    "annual_fee": 250,
+                    "annual_fee": 25000,
                     "reward_desc": "4x at restaurants/U.S. supermarkets, 3x on flights, 1x on other purchases",
                     "interest_rate": 2099,
                     "min_credit_score": 700
@@ -66,7 +66,7 @@ class Seeder:
                 {
                     "name": "Amex Blue Cash Preferred",
                     "description": "Cash back card for everyday spending",
-                    "annual_fee": 95,
+                    "annual_fee": 9500,
                     "reward_desc": "6% at U.S. supermarkets (up to $6k/year), 6% on streaming, 3% at transit/gas stations",
                     "interest_rate": 1924,
                     "min_credit_score": 680
@@ -89,7 +89,7 @@ class Seeder:
                 {
                     "name": "Citi Premier",
                     "description": "Travel rewards card with flexible points",
-                    "annual_fee": 95,
+                    "annual_fee": 9500,
                     "reward_desc": "3x on restaurants/supermarkets/gas stations/air travel/hotels",
                     "interest_rate": 2124,
                     "min_credit_score": 700
@@ -112,7 +112,7 @@ class Seeder:
                 {
                     "name": "Capital One Venture X",
                     "description": "Premium travel rewards card",
-                    "annual_fee": 395,
+                    "annual_fee": 39500,
                     "reward_desc": "2x miles on all purchases, 5x on flights, 10x on hotels/rental cars",
                     "interest_rate": 2199,
                     "min_credit_score": 720
@@ -1,9 +1,8 @@
-import bcrypt
-from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.user.crud import user_dao
 from src.backend.user.schemas import AssignCardRequest, AssignedCardResponse, ProfileResponse, RegisterRequest, RegisterResponse
+from src.common.data_classes import TokenPayload
 from src.common.exception import errors
 from src.common.security.password_secret import password_secret
 from src.common.security.jwt import jwt_token
@@ -24,15 +23,15 @@ class UserService:
          # check if we have guest user
          guest_user = await user_dao.get_by_guest_id(db, obj.device_id)
          if guest_user:
-           salt = bcrypt.gensalt()
-           obj.password = password_secret.get_hash_password(obj.password, salt)
+           salt = password_secret.gen_salt()
+           obj.password = await password_secret.hash_password(obj.password, salt)
            dict_obj = obj.model_dump()
            dict_obj.update({'salt': salt})
            dict_obj.update({'guest_id': None})
            await user_dao.update(db, guest_user.id, dict_obj)
          else:
-           salt = bcrypt.gensalt()
-           obj.password = password_secret.get_hash_password(obj.password, salt)
+           salt = password_secret.gen_salt()
+           obj.password = await password_secret.hash_password(obj.password, salt)
            dict_obj = obj.model_dump()
            dict_obj.update({'salt': salt})
            await user_dao.create(db, dict_obj)
@@ -52,18 +51,16 @@ class UserService:
        await db.rollback()
        raise e
     
-    async def get_profile(self, db: AsyncSession, request: Request) -> ProfileResponse:
+    async def get_profile(self, db: AsyncSession, token_payload: TokenPayload) -> ProfileResponse:
        try:
-          token_payload = await jwt_token.verify_auth_user(request)
           user = await user_dao.get_by_id(db, token_payload.id)
           data = ProfileResponse.model_validate(user)
           return data
        except Exception as e:
           raise e
        
-    async def assign_cards(self, db: AsyncSession, request: Request, obj: AssignCardRequest) -> None:
+    async def assign_cards(self, db: AsyncSession, token_payload: TokenPayload, obj: AssignCardRequest) -> None:
         try:
-          token_payload = await jwt_token.verify_auth_user(request)
           user = await user_dao.get_by_id_card_relation(db,token_payload.id)
           if not user:
             raise errors.TokenError(msg='Not Authenticated')
@@ -82,9 +79,8 @@ class UserService:
           await db.rollback()
           raise e
     
-    async def get_user_cards(self, db: AsyncSession, request: Request) -> list[AssignedCardResponse]:
+    async def get_user_cards(self, db: AsyncSession, token_payload: TokenPayload) -> list[AssignedCardResponse]:
         try:
-          token_payload = await jwt_token.verify_auth_user(request)
           user = await user_dao.get_by_id_card_bank_relation(db, token_payload.id)
           if not user:
              raise errors.TokenError(msg='Not Authenticated')
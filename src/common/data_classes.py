@@ -2,7 +2,7 @@ import dataclasses
 from datetime import datetime
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class IpInfo:
     ip: str
     country: str | None
@@ -10,7 +10,7 @@ class IpInfo:
     city: str | None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class UserAgentInfo:
     user_agent: str
     os: str | None
@@ -41,4 +41,38 @@ class TokenPayload:
     id: int
     session_uuid: str
     expire_time: datetime
+    family_id: str | None = None
+
+
+@dataclasses.dataclass
+class TokenSession:
+    session_uuid: str
+    expire_time: datetime
+
 
+
+@dataclasses.dataclass
+class CacheStats:
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+@dataclasses.dataclass
+class ResponseCacheStats:
+    hits: int
+    misses: int
+    not_modified: int
+    hit_rate: float
+    bytes_served: int
+    avg_bytes_served: int
+
+
+@dataclasses.dataclass
+class RequestContextStats:
+    requests: int = 0
+    ip_enrichments: int = 0
+    user_agent_enrichments: int = 0
@@ -2,22 +2,44 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
+
 from math import ceil
-from typing import TYPE_CHECKING, Any, Generic, Sequence, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, Sequence, TypeVar
+
+import msgspec
 
 from fastapi import Depends, Query
-from fastapi_pagination import pagination_ctx
+from fastapi_pagination import pagination_ctx, resolve_params
 from fastapi_pagination.bases import AbstractPage, AbstractParams, RawParams
-from fastapi_pagination.ext.sqlalchemy import apaginate
+from fastapi_pagination.ext.sqlalchemy import apaginate, create_count_query
 from pydantic import BaseModel, Field
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import postgresql
+
+from src.common.exception import errors
+from src.common.response.response_cache import response_cache
+from src.core.settings import settings
+from src.database.redis import redis
+from src.utils.cache import LocalCache
 
 if TYPE_CHECKING:
     from sqlalchemy import Select
     from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute
 
 T = TypeVar('T')
 SchemaT = TypeVar('SchemaT')
 
+CountStrategy = Literal['exact', 'cached', 'estimate']
+
+# Planner estimates of the estimate-counted queries, keyed by query digest
+_estimates = LocalCache(
+    maxsize=settings.PAGINATION_COUNT_ESTIMATE_CACHE_MAXSIZE, ttl=settings.PAGINATION_COUNT_EXPIRE_SECONDS
+)
+
 
 class _CustomPageParams(BaseModel, AbstractParams):
     """Custom pagination parameters"""
@@ -32,6 +54,20 @@ class _CustomPageParams(BaseModel, AbstractParams):
         )
 
 
+class _KnownTotalPageParams(_CustomPageParams):
+    """Pagination parameters for a page whose total was resolved without a COUNT query"""
+
+    total: int = 0
+    total_strategy: CountStrategy = 'exact'
+
+    def to_raw_params(self) -> RawParams:
+        return RawParams(
+            limit=self.size,
+            offset=self.size * (self.page - 1),
+            include_total=False,
+        )
+
+
 class _Links(BaseModel):
     """Pagination links"""
 
@@ -50,6 +86,7 @@ class _PageDetails(BaseModel):
     page: int = Field(description='Current page number')
     size: int = Field(description='Number of items per page')
     total_pages: int = Field(description='Total number of pages')
+    total_strategy: CountStrategy = Field('exact', description='How total was produced: exact, cached or estimate')
 
 
 class _CustomPage(_PageDetails, AbstractPage[T], Generic[T]):
@@ -64,6 +101,9 @@ class _CustomPage(_PageDetails, AbstractPage[T], Generic[T]):
         params: _CustomPageParams,
         total: int = 0,
     ) -> _CustomPage[T]:
+        total_strategy = 'exact'
+        if isinstance(params, _KnownTotalPageParams):
+            total, total_strategy = params.total, params.total_strategy
         page = params.page
         size = params.size
         total_pages = ceil(total / size)
@@ -73,6 +113,7 @@ class _CustomPage(_PageDetails, AbstractPage[T], Generic[T]):
             page=page,
             size=size,
             total_pages=total_pages,
+            total_strategy=total_strategy,
         )
 
 
@@ -101,18 +142,177 @@ class PageData(_PageDetails, Generic[SchemaT]):
     items: Sequence[SchemaT]
 
 
-async def paging_data(db: AsyncSession, select: Select) -> dict[str, Any]:
+class _CursorPageParams(BaseModel, AbstractParams):
+    """Cursor pagination parameters"""
+
+    cursor: str | None = Query(None, description='Cursor returned with the previous page')
+    size: int = Query(20, gt=0, le=200, description='Number of items per page')
+
+    def to_raw_params(self) -> RawParams:
+        return RawParams(limit=self.size + 1)
+
+
+class _CursorPageDetails(BaseModel):
+    """Cursor pagination details"""
+
+    items: list = Field([], description='List of items on the current page')
+    size: int = Field(description='Number of items per page')
+    next_cursor: str | None = Field(None, description='Cursor of the next page')
+    has_more: bool = Field(description='Whether there is a next page')
+
+
+class _CursorPage(_CursorPageDetails, AbstractPage[T], Generic[T]):
+    """Cursor pagination class"""
+
+    __params_type__ = _CursorPageParams
+
+    @classmethod
+    def create(
+        cls,
+        items: list,
+        params: _CursorPageParams,
+        next_cursor: str | None = None,
+    ) -> _CursorPage[T]:
+        return cls(items=items, size=params.size, next_cursor=next_cursor, has_more=next_cursor is not None)
+
+
+class CursorPageData(_CursorPageDetails, Generic[SchemaT]):
+    """
+    Standard response model for cursor pagination APIs that includes the data schema
+
+    Example::
+
+        @router.get('/test', dependencies=[DependsCursorPagination])
+        async def test(db: DBSession) -> ResponseSchemaModel[CursorPageData[GetApiDetail]]:
+            data = await cursor_paging_data(db, stmt, Api.name, Api.id)
+            return response_base.success(data=data)
+    """
+
+    items: Sequence[SchemaT]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(msgspec.json.encode(values)).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = msgspec.json.decode(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError, msgspec.DecodeError):
+        raise errors.RequestError(msg='Invalid cursor')
+    if not isinstance(values, list):
+        raise errors.RequestError(msg='Invalid cursor')
+    return values
+
+
+async def cursor_paging_data(
+    db: AsyncSession, select: Select, *keys: InstrumentedAttribute
+) -> _CursorPage:
+    """
+    Create keyset pagination data, seeking past the cursor instead of using OFFSET and COUNT
+
+    :param db: Database session
+    :param select: SQL query statement, ordered ascending by ``keys``
+    :param keys: Unique ordering columns the cursor is made of
+    :return:
+    """
+    params: _CursorPageParams = resolve_params()
+    if params.cursor:
+        values = decode_cursor(params.cursor)
+        if len(values) != len(keys):
+            raise errors.RequestError(msg='Invalid cursor')
+        select = select.where(tuple_(*keys) > tuple_(*values))
+    result = await db.execute(select.limit(params.to_raw_params().limit))
+    items = list(result.scalars().all())
+    next_cursor = None
+    if len(items) > params.size:
+        items = items[: params.size]
+        next_cursor = encode_cursor([getattr(items[-1], key.key) for key in keys])
+    return _CursorPage.create(items, params, next_cursor=next_cursor)
+
+
+def _count_digest(select: Select) -> str:
+    compiled = select.compile(dialect=postgresql.dialect())
+    return hashlib.blake2b(f'{compiled}{sorted(compiled.params.items())!r}'.encode(), digest_size=16).hexdigest()
+
+
+async def _exact_count(db: AsyncSession, select: Select) -> int:
+    return await db.scalar(create_count_query(select))
+
+
+async def _cached_count(db: AsyncSession, select: Select, digest: str) -> tuple[int, CountStrategy]:
+    # Totals are keyed by the catalog version read before counting, so a catalog write makes
+    # them unreachable and a count racing with the write can only land under the old version
+    version, total = await response_cache.get_versioned(settings.PAGINATION_COUNT_REDIS_PREFIX, digest)
+    if total is not None:
+        return int(total), 'cached'
+    total = await _exact_count(db, select)
+    await redis.setex(
+        f'{settings.PAGINATION_COUNT_REDIS_PREFIX}:{version}:{digest}', settings.PAGINATION_COUNT_EXPIRE_SECONDS, total
+    )
+    return total, 'exact'
+
+
+async def _estimated_count(db: AsyncSession, select: Select) -> tuple[int, CountStrategy]:
+    # The planner is asked once per query and worker for a while, not on every request
+    digest = _count_digest(select)
+    total = _estimates.get(digest)
+    if total is None:
+        conn = await db.connection()
+        sql = select.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True})
+        plan = (await conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+        if isinstance(plan, str):
+            plan = msgspec.json.decode(plan)
+        total = int(plan[0]['Plan']['Plan Rows'])
+        _estimates.set(digest, total)
+    # Planner estimates are rough on small tables, where an exact count is cheap anyway
+    if total < settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+        return await _cached_count(db, select, digest)
+    return total, 'estimate'
+
+
+async def paging_data(db: AsyncSession, select: Select, count: CountStrategy = 'exact') -> dict[str, Any]:
     """
     Create pagination data using SQLAlchemy
 
     :param db: Database session
     :param select: SQL query statement
+    :param count: How the total is produced; ``cached`` reuses a recent exact count of the same
+        filtered query, ``estimate`` uses the planner row estimate and suits large unfiltered tables
     :return:
     """
-    paginated_data: _CustomPage = await apaginate(db, select)
+    if count == 'exact':
+        paginated_data: _CustomPage = await apaginate(db, select)
+        return paginated_data
+
+    if count == 'cached':
+        total, total_strategy = await _cached_count(db, select, _count_digest(select))
+    else:
+        total, total_strategy = await _estimated_count(db, select)
+    params: _CustomPageParams = resolve_params()
+    paginated_data: _CustomPage = await apaginate(
+        db,
+        select,
+        params=_KnownTotalPageParams(page=params.page, size=params.size, total=total, total_strategy=total_strategy),
+    )
     return paginated_data
 
 
+def paging_sequence(sequence: Sequence, hydrate: Callable[[Sequence], list] | None = None) -> _CustomPage:
+    """
+    Create pagination data from an in-memory sequence
+
+    :param sequence: All matching items, usually ids
+    :param hydrate: Turns the items of the current page into response items
+    :return:
+    """
+    params: _CustomPageParams = resolve_params()
+    raw_params = params.to_raw_params()
+    items = sequence[raw_params.offset : raw_params.offset + raw_params.limit]
+    return _CustomPage.create(hydrate(items) if hydrate else list(items), params, total=len(sequence))
+
+
 # Pagination dependency injection
 DependsPagination = Depends(pagination_ctx(_CustomPage))
+DependsCursorPagination = Depends(pagination_ctx(_CursorPage))
 
@@ -0,0 +1,229 @@
+import hashlib
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi_pagination.api import resolve_params
+from fastapi_pagination.errors import UninitializedConfigurationError
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.common.data_classes import ResponseCacheStats
+from src.common.response.response_code import CustomResponseCode
+from src.core.settings import settings
+from src.database.redis import redis
+from src.utils.serializers import MsgSpecJSONResponse, etag_matches, not_modified_response
+from src.utils.tasks import run_in_background
+from src.utils.timezone import timezone
+
+_CATALOG_CHANGED = 'catalog_changed'
+
+# Catalog version the response being built will be cached under
+_building_version: ContextVar[int | None] = ContextVar('catalog_building_version', default=None)
+
+# KEYS: catalog version
+# ARGV: entry key prefix, entry key
+# Returns the current catalog version and the entry cached for it, if any
+_GET_VERSIONED_LUA = """
+local version = redis.call('GET', KEYS[1]) or '0'
+return {version, redis.call('GET', ARGV[1] .. ':' .. version .. ':' .. ARGV[2])}
+"""
+
+# KEYS: catalog version, version times
+# ARGV: current timestamp, oldest timestamp kept
+# Returns the new catalog version after recording when it was reached
+_BUMP_VERSION_LUA = """
+local version = redis.call('INCR', KEYS[1])
+redis.call('ZADD', KEYS[2], ARGV[1], version)
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', '(' .. ARGV[2])
+return version
+"""
+
+
+@lru_cache
+def _type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+class ResponseCache:
+    """
+    Redis cache of encoded catalog responses
+
+    Entries are keyed by the catalog version, so bumping the version after a bank or card
+    write makes every cached page unreachable at once; stale entries simply expire.
+    The same version makes the strong ETag, so revalidation needs no database work.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.bytes_served = 0
+        self._get_versioned = redis.register_script(_GET_VERSIONED_LUA)
+        self._bump_version = redis.register_script(_BUMP_VERSION_LUA)
+
+    @staticmethod
+    def request_key(request: Request) -> str:
+        """
+        Route, normalized query string and resolved pagination parameters of a request
+
+        :param request: FastAPI request object
+        :return:
+        """
+        try:
+            params = resolve_params().model_dump()
+        except UninitializedConfigurationError:
+            params = {}
+        # Values are kept as sent, the handlers see them unstripped too
+        query = sorted((key, value) for key, value in request.query_params.multi_items() if key not in params)
+        query += sorted(params.items())
+        return f'{request.url.path}?{urlencode(query)}'
+
+    async def get_versioned(self, prefix: str, key: str) -> tuple[int, str | None]:
+        """
+        Current catalog version and the entry stored under it, read in a single round trip
+
+        Also used for other values that are only valid for one catalog version, such as the
+        cached pagination totals.
+
+        :param prefix: Entry key prefix
+        :param key: Entry key within the version
+        :return:
+        """
+        version, value = await self._get_versioned(keys=[settings.CATALOG_VERSION_REDIS_KEY], args=[prefix, key])
+        return int(version), value
+
+    async def get(self, request_key: str) -> tuple[int, bytes | None]:
+        version, body = await self.get_versioned(settings.CATALOG_CACHE_REDIS_PREFIX, request_key)
+        return version, body.encode() if body is not None else None
+
+    @staticmethod
+    def etag(version: int, request_key: str) -> str:
+        return f'"{version}-{hashlib.blake2b(request_key.encode(), digest_size=8).hexdigest()}"'
+
+    async def set(self, version: int, request_key: str, body: bytes) -> None:
+        await redis.setex(
+            f'{settings.CATALOG_CACHE_REDIS_PREFIX}:{version}:{request_key}',
+            settings.CATALOG_CACHE_EXPIRE_SECONDS,
+            body,
+        )
+
+    async def cached(self, request: Request, schema: Any, build: Callable[[], Awaitable[Any]]) -> Response:
+        """
+        Serve a success response from the cache, building and caching it on a miss
+
+        Clients revalidating with a current ``If-None-Match`` get 304 without any page being built.
+
+        :param request: FastAPI request object
+        :param schema: Response data schema the built data is validated against
+        :param build: Coroutine function returning the response data
+        :return:
+        """
+        if not settings.CATALOG_CACHE_ENABLED:
+            return self._render(schema, await build()).with_etag(request)
+
+        request_key = self.request_key(request)
+        version, body = await self.get(request_key)
+        etag = self.etag(version, request_key)
+        if etag_matches(request, etag):
+            self.not_modified += 1
+            return not_modified_response(etag)
+
+        if body is not None:
+            self.hits += 1
+            self.bytes_served += len(body)
+            return Response(
+                body, media_type='application/json', headers={'ETag': etag, 'Cache-Control': 'no-cache'}
+            )
+
+        self.misses += 1
+        token = _building_version.set(version)
+        try:
+            data = await build()
+        finally:
+            _building_version.reset(token)
+        response = self._render(schema, data)
+        run_in_background(self.set(version, request_key, response.body))
+        return response.with_etag(request, etag)
+
+    @staticmethod
+    def _render(schema: Any, data: Any) -> MsgSpecJSONResponse:
+        adapter = _type_adapter(schema)
+        data = adapter.dump_python(adapter.validate_python(data, from_attributes=True), mode='json')
+        res = CustomResponseCode.HTTP_200
+        content = {'code': res.code, 'msg': res.msg, 'data': data}
+        return MsgSpecJSONResponse(content)
+
+    @staticmethod
+    def mark_changed(db: AsyncSession) -> None:
+        """
+        Flag the session so the catalog version is bumped once its transaction commits
+
+        :param db: Database session
+        :return:
+        """
+        db.info[_CATALOG_CHANGED] = True
+
+    async def bump_version(self) -> int:
+        now = timezone.now().timestamp()
+        return await self._bump_version(
+            keys=[settings.CATALOG_VERSION_REDIS_KEY, settings.CATALOG_VERSION_TIMES_REDIS_KEY],
+            args=[now, now - settings.CATALOG_CHANGES_RETENTION_SECONDS],
+        )
+
+    @staticmethod
+    def building_version() -> int | None:
+        """
+        Catalog version the response being built will be cached under, outside a build None
+
+        Data served from memory must be at least this fresh, or a stale page would be cached
+        under the new version.
+
+        :return:
+        """
+        return _building_version.get()
+
+    @staticmethod
+    async def version() -> int:
+        return int(await redis.get(settings.CATALOG_VERSION_REDIS_KEY) or 0)
+
+    @staticmethod
+    async def version_time(version: int) -> datetime | None:
+        """
+        When the catalog reached a version, if that is still remembered
+
+        :param version: Catalog version
+        :return:
+        """
+        score = await redis.zscore(settings.CATALOG_VERSION_TIMES_REDIS_KEY, version)
+        return timezone.from_timestamp(score) if score is not None else None
+
+    def stats(self) -> ResponseCacheStats:
+        lookups = self.hits + self.misses
+        return ResponseCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            not_modified=self.not_modified,
+            hit_rate=round(self.hits / lookups, 4) if lookups else 0.0,
+            bytes_served=self.bytes_served,
+            avg_bytes_served=round(self.bytes_served / self.hits) if self.hits else 0,
+        )
+
+
+response_cache: ResponseCache = ResponseCache()
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_catalog_version(session: Session) -> None:
+    if session.info.pop(_CATALOG_CHANGED, False):
+        run_in_background(response_cache.bump_version())
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_catalog_change(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_CATALOG_CHANGED, None)
@@ -2,11 +2,11 @@
 # -*- coding: utf-8 -*-
 from typing import Any, Generic, TypeVar
 
-from fastapi import Response
+from fastapi import Request, Response
 from pydantic import BaseModel, Field
 
 from src.common.response.response_code import CustomResponse, CustomResponseCode
-from src.utils.serializers import MsgSpecJSONResponse
+from src.utils.serializers import MsgSpecJSONResponse, etag_matches, not_modified_response
 
 SchemaT = TypeVar('SchemaT')
 
@@ -131,5 +131,39 @@ class ResponseBase:
         """
         return MsgSpecJSONResponse({'code': res.code, 'msg': res.msg, 'data': data})
 
+    def conditional_success(
+        self,
+        request: Request,
+        *,
+        res: CustomResponseCode | CustomResponse = CustomResponseCode.HTTP_200,
+        data: Any | None = None,
+        etag: str | None = None,
+    ) -> Response:
+        """
+        Success response carrying a strong ETag, or 304 when ``If-None-Match`` already matches it
+
+        Like :meth:`fast_success`, the data skips Pydantic validation against the response model.
+
+        :param request: FastAPI request object
+        :param res: Response information
+        :param data: Response data
+        :param etag: Quoted entity tag, a hash of the encoded body when omitted
+        :return: FastAPI Response object
+        """
+        if isinstance(data, BaseModel):
+            data = data.model_dump(mode='json')
+        return MsgSpecJSONResponse({'code': res.code, 'msg': res.msg, 'data': data}).with_etag(request, etag)
+
+    @staticmethod
+    def not_modified(request: Request, etag: str) -> Response | None:
+        """
+        304 response when the client already holds ``etag``, checked before doing any work
+
+        :param request: FastAPI request object
+        :param etag: Quoted entity tag
+        :return: FastAPI Response object or None
+        """
+        return not_modified_response(etag) if etag_matches(request, etag) else None
+
 
 response_base: ResponseBase = ResponseBase()
@@ -1,25 +1,143 @@
 # #!/usr/bin/env python3
 # # -*- coding: utf-8 -*-
+import asyncio
 from datetime import timedelta
+import hashlib
 import json
-from typing import Any
+import time
+from typing import Annotated, Any
 from uuid import uuid4
 
 from fastapi import Depends, Request
 from fastapi.security import HTTPBearer
 from fastapi.security.utils import get_authorization_scheme_param
 from jose import ExpiredSignatureError, JWTError, jwt
+from redis.asyncio.client import Pipeline
 
-from src.common.data_classes import AccessToken, Token, RefreshToken, TokenPayload
+from src.common.data_classes import AccessToken, Token, RefreshToken, TokenPayload, TokenSession
 from src.common.exception.errors import TokenError
+from src.common.log import log
 from src.core.settings import settings
 from src.database.redis import redis
+from src.utils.bloom import BloomFilter
+from src.utils.cache import LocalCache
+from src.utils.latency import LatencySampler
 from src.utils.timezone import timezone
 
 # JWT authorization dependency injection
 DependsJwtAuth = Depends(HTTPBearer())
 
+# Atomically rotate a refresh token family and issue its next refresh token plus a new access
+# token. The family record holds the digest of the only refresh token that may be used next and
+# the session uuid of the access token issued with it, which the new access token replaces.
+# Returns {1, replaced session uuid} on success, {0, ''} when the family is unknown or expired
+# and {-1, ''} when an already rotated refresh token of the family is presented again.
+_ROTATE_REFRESH_TOKEN_LUA = """
+local replaced = ''
+if ARGV[11] == '' then
+    -- Refresh tokens issued before token families keep a key per token. It is marked used,
+    -- expiring with the token, and the token continues as a new family
+    local state = redis.call('GET', KEYS[6])
+    if state == 'used' then
+        return {-1, ''}
+    end
+    if state == 'live' then
+        redis.call('SET', KEYS[6], 'used', 'KEEPTTL')
+    elseif redis.call('GET', KEYS[7]) == ARGV[12] then
+        redis.call('DEL', KEYS[7])
+    else
+        return {0, ''}
+    end
+    redis.call('ZREM', KEYS[4], ARGV[2])
+else
+    local family = redis.call('HMGET', KEYS[1], 'digest', 'session')
+    if not family[1] then
+        return {0, ''}
+    end
+    if family[1] ~= ARGV[2] then
+        return {-1, ''}
+    end
+    replaced = family[2] or ''
+    redis.call('DEL', ARGV[13] .. ':' .. replaced, ARGV[14] .. ':' .. replaced)
+end
+
+redis.call('HSET', KEYS[1], 'digest', ARGV[3], 'session', ARGV[9])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[5], ARGV[6])
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+
+redis.call('SET', KEYS[2], ARGV[7], 'EX', ARGV[8])
+if ARGV[10] ~= '' then
+    redis.call('SET', KEYS[5], ARGV[10], 'EX', ARGV[8])
+end
+return {1, replaced}
+"""
+
+# KEYS: session index, refresh index of tokens issued before token families
+# ARGV: access token prefix, extra info prefix, token family prefix, refresh token prefix
+# Deletes every session of a user and returns the session uuids of the deleted access tokens
+_REVOKE_ALL_TOKENS_LUA = """
+local session_uuids = {}
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    local family_key = ARGV[3] .. ':' .. member
+    -- Entries indexed before token families are access token session uuids
+    local session_uuid = redis.call('HGET', family_key, 'session') or member
+    redis.call('DEL', family_key, ARGV[1] .. ':' .. session_uuid, ARGV[2] .. ':' .. session_uuid)
+    table.insert(session_uuids, session_uuid)
+end
+for _, digest in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+    redis.call('DEL', ARGV[4] .. ':' .. digest)
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+return session_uuids
+"""
+
+
+def get_token_payload(request: Request) -> TokenPayload:
+    """
+    Get the token payload already verified by the JWT auth middleware
+
+    :param request: FastAPI request object
+    :return:
+    """
+    if not isinstance(request.user, TokenPayload):
+        raise TokenError(msg='Not Authenticated')
+    return request.user
+
+
+# Verified token payload dependency injection
+CurrentTokenPayload = Annotated[TokenPayload, Depends(get_token_payload)]
+
 class JWTToken:
+    def __init__(self) -> None:
+        # Recently verified tokens keyed by `{user_id}:{session_uuid}`
+        self.verified_cache = LocalCache(
+            maxsize=settings.TOKEN_LOCAL_CACHE_MAXSIZE,
+            ttl=settings.TOKEN_LOCAL_CACHE_EXPIRE_SECONDS,
+        )
+        self.redis_latency = LatencySampler()
+        # Bumped on every revocation seen, so a lookup that raced one does not cache its result
+        self._revocation_generation = 0
+        # Revoked session uuids, only consulted in stateless mode
+        self.revoked_filter = self._new_revoked_filter()
+        self._revocation_tasks: list[asyncio.Task] = []
+        self._rotate_refresh_token = redis.register_script(_ROTATE_REFRESH_TOKEN_LUA)
+        self._revoke_all_tokens = redis.register_script(_REVOKE_ALL_TOKENS_LUA)
+
+    @property
+    def access_token_expire_seconds(self) -> int:
+        if settings.TOKEN_STATELESS:
+            return settings.TOKEN_STATELESS_EXPIRE_SECONDS
+        return settings.TOKEN_EXPIRE_SECONDS
+
+    @staticmethod
+    def _new_revoked_filter() -> BloomFilter:
+        return BloomFilter(settings.TOKEN_REVOKED_FILTER_CAPACITY, settings.TOKEN_REVOKED_FILTER_ERROR_RATE)
+
+    @staticmethod
+    def _refresh_token_digest(refresh_token: str) -> str:
+        return hashlib.blake2b(refresh_token.encode(), digest_size=16).hexdigest()
 
     def _jwt_encode(self,payload: dict[str, Any]) -> str:
         return jwt.encode(
@@ -34,72 +152,261 @@ class JWTToken:
             session_uuid = payload.get('session_uuid') or 'debug'
             user_id = payload.get('sub')
             expire_time = payload.get('exp')
+            family_id = payload.get('fid')
             if not user_id:
                 raise TokenError(msg='Invalid token')
         except ExpiredSignatureError:
             raise TokenError(msg='Token has expired')
         except (JWTError, Exception):
             raise TokenError(msg='Invalid token')
-        return TokenPayload(id=int(user_id), session_uuid=session_uuid, expire_time=expire_time)
+        return TokenPayload(id=int(user_id), session_uuid=session_uuid, expire_time=expire_time, family_id=family_id)
     
     async def jwt_authentication(self,token: str) -> TokenPayload:
         token_payload = self.jwt_decode(token)
+        if settings.TOKEN_STATELESS:
+            return await self._stateless_authentication(token_payload)
+
         user_id = token_payload.id
-        redis_token = await redis.get(f'{settings.TOKEN_REDIS_PREFIX}:{user_id}:{token_payload.session_uuid}')
+        session_key = f'{user_id}:{token_payload.session_uuid}'
+        if self.verified_cache.get(session_key) == token:
+            return token_payload
+
+        generation = self._revocation_generation
+        start_time = time.perf_counter()
+        redis_token = await redis.get(f'{settings.TOKEN_REDIS_PREFIX}:{session_key}')
+        self.redis_latency.record(time.perf_counter() - start_time)
         if not redis_token:
             raise TokenError(msg='Token expired')
 
         if token != redis_token:
             raise TokenError(msg='Token invalid')
-        
+
+        # A revocation handled while waiting for redis may be of this very session
+        if generation == self._revocation_generation:
+            expire_time = token_payload.expire_time
+            self.verified_cache.set(session_key, token, ttl=int(expire_time) - time.time() if expire_time else None)
+        return token_payload
+
+    async def _stateless_authentication(self, token_payload: TokenPayload) -> TokenPayload:
+        """
+        Accept a signature-verified token unless its session is in the revocation filter
+
+        Only a filter hit, which may be a false positive, is confirmed against redis.
+        """
+        session_uuid = token_payload.session_uuid
+        if session_uuid in self.revoked_filter:
+            if await redis.zscore(settings.TOKEN_REVOKED_REDIS_KEY, session_uuid) is not None:
+                raise TokenError(msg='Token has been revoked')
         return token_payload
 
+    def verified_cache_stats(self) -> dict[str, Any]:
+        """
+        Verified token cache statistics and the redis GET latency a cache hit saves
+        """
+        return {
+            'cache': self.verified_cache.stats(),
+            'latency_saved_ms': self.redis_latency.summary(),
+            'stateless': settings.TOKEN_STATELESS,
+            'revoked_filter': {'entries': self.revoked_filter.count, 'bytes': self.revoked_filter.nbytes},
+        }
+
+    def _remove_revoked(self, session_key: str) -> None:
+        self._revocation_generation += 1
+        self.verified_cache.delete(session_key)
+        self.revoked_filter.add(session_key.split(':', 1)[-1])
+
+    async def _publish_revocation(self, *session_keys: str) -> None:
+        if not session_keys:
+            return
+        for session_key in session_keys:
+            self._remove_revoked(session_key)
+        if settings.TOKEN_STATELESS:
+            # Revoked sessions only need tracking until their access tokens expire, which for
+            # tokens issued before stateless mode was switched on is the longer stateful lifetime
+            expire_time = int(time.time()) + max(settings.TOKEN_EXPIRE_SECONDS, settings.TOKEN_STATELESS_EXPIRE_SECONDS)
+            await redis.zadd(
+                settings.TOKEN_REVOKED_REDIS_KEY,
+                {session_key.split(':', 1)[-1]: expire_time for session_key in session_keys},
+            )
+        await redis.publish(settings.TOKEN_REVOKE_CHANNEL, ' '.join(session_keys))
+
+    async def sync_revoked_filter(self) -> None:
+        """
+        Rebuild the revocation filter from the revoked sessions in redis, dropping expired ones
+        """
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(settings.TOKEN_REVOKED_REDIS_KEY, '-inf', int(time.time()))
+            pipe.zrange(settings.TOKEN_REVOKED_REDIS_KEY, 0, -1)
+            _, session_uuids = await pipe.execute()
+        revoked_filter = self._new_revoked_filter()
+        for session_uuid in session_uuids:
+            revoked_filter.add(session_uuid)
+        self.revoked_filter = revoked_filter
+
+    async def _sync_revoked_filter_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TOKEN_REVOKED_SYNC_SECONDS)
+            try:
+                await self.sync_revoked_filter()
+            except Exception as e:
+                log.warning(f'Token revocation filter sync error: {e}')
+
+    async def _listen_revocations(self) -> None:
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(settings.TOKEN_REVOKE_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message['type'] == 'message':
+                        for session_key in message['data'].split():
+                            self._remove_revoked(session_key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Drop everything we may have missed while disconnected
+                self._revocation_generation += 1
+                self.verified_cache.clear()
+                log.warning(f'Token revocation listener error: {e}')
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start_revocation_listener(self) -> None:
+        if self._revocation_tasks:
+            return
+        self._revocation_tasks.append(asyncio.create_task(self._listen_revocations()))
+        if settings.TOKEN_STATELESS:
+            await self.sync_revoked_filter()
+            self._revocation_tasks.append(asyncio.create_task(self._sync_revoked_filter_periodically()))
+
+    async def stop_revocation_listener(self) -> None:
+        for task in self._revocation_tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._revocation_tasks = []
+
     async def create_token(self, user_id: str, **kwargs) -> Token:
-        accessToken = await self._create_access_token(user_id, **kwargs)
-        refreshToken =  await self._create_refresh_token(user_id)
-        return Token(access_token=accessToken, refresh_token=refreshToken)
+        # Encode both tokens before any I/O, then write them in a single round trip
+        family_id = uuid4().hex
+        access_token = self._encode_access_token(user_id, family_id)
+        refresh_token = self._encode_refresh_token(user_id, family_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            self._store_access_token(pipe, user_id, access_token, **kwargs)
+            self._store_session(pipe, user_id, family_id, access_token, refresh_token)
+            await pipe.execute()
+        return Token(access_token=access_token, refresh_token=refresh_token)
 
-    async def _create_access_token(self, user_id: str, **kwargs) -> AccessToken:
-        expire = timezone.now() + timedelta(seconds=settings.TOKEN_EXPIRE_SECONDS)
+    def _encode_access_token(self, user_id: str, family_id: str) -> AccessToken:
+        expire = timezone.now() + timedelta(seconds=self.access_token_expire_seconds)
         session_uuid = str(uuid4())
         access_token = self._jwt_encode({
             'session_uuid': session_uuid,
+            'fid': family_id,
             'exp': expire,
             'sub': user_id,
         })
+        return AccessToken(access_token=access_token, access_token_expire_time=expire, session_uuid=session_uuid)
 
-        await redis.setex(
-            f'{settings.TOKEN_REDIS_PREFIX}:{user_id}:{session_uuid}',
-            settings.TOKEN_EXPIRE_SECONDS,
-            access_token,
+    def _store_access_token(self, pipe: Pipeline, user_id: str, access_token: AccessToken, **kwargs) -> None:
+        pipe.setex(
+            f'{settings.TOKEN_REDIS_PREFIX}:{user_id}:{access_token.session_uuid}',
+            self.access_token_expire_seconds,
+            access_token.access_token,
         )
 
         # Store additional token information separately if needed
         if kwargs:
-            await redis.setex(
-                f'{settings.TOKEN_EXTRA_INFO_REDIS_PREFIX}:{session_uuid}',
-                settings.TOKEN_EXPIRE_SECONDS,
+            pipe.setex(
+                f'{settings.TOKEN_EXTRA_INFO_REDIS_PREFIX}:{access_token.session_uuid}',
+                self.access_token_expire_seconds,
                 json.dumps(kwargs, ensure_ascii=False),
             )
-        return AccessToken(access_token=access_token, access_token_expire_time=expire, session_uuid=session_uuid)
 
-    async def _create_refresh_token(self, user_id: str) -> RefreshToken:
+    def _encode_refresh_token(self, user_id: str, family_id: str) -> RefreshToken:
         expire = timezone.now() + timedelta(seconds=settings.TOKEN_REFRESH_EXPIRE_SECONDS)
-        refresh_token = self._jwt_encode({'exp': expire, 'sub': user_id})
-        await redis.setex(
-            f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{user_id}:{refresh_token}',
-            settings.TOKEN_REFRESH_EXPIRE_SECONDS,
-            refresh_token,
-        )
+        refresh_token = self._jwt_encode({'exp': expire, 'sub': user_id, 'jti': uuid4().hex, 'fid': family_id})
         return RefreshToken(refresh_token=refresh_token, refresh_token_expire_time=expire)
-    
 
-    async def create_new_token(self,user_id: str, token: RefreshToken, **kwargs) -> Token:
-        redis_refresh_token = await redis.get(f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{user_id}:{token.refresh_token}')
-        if not redis_refresh_token or redis_refresh_token != token.refresh_token:
+    def _store_session(
+        self, pipe: Pipeline, user_id: str, family_id: str, access_token: AccessToken, refresh_token: RefreshToken
+    ) -> None:
+        # One record per token family, holding the digest of its current refresh token and the
+        # session uuid of its current access token
+        family_key = f'{settings.TOKEN_REFRESH_FAMILY_REDIS_PREFIX}:{user_id}:{family_id}'
+        pipe.hset(
+            family_key,
+            mapping={
+                'digest': self._refresh_token_digest(refresh_token.refresh_token),
+                'session': access_token.session_uuid,
+            },
+        )
+        pipe.expire(family_key, settings.TOKEN_REFRESH_EXPIRE_SECONDS)
+
+        # Index the session under the user by its token family, which survives refreshes, scored
+        # by the expire time of its refresh token
+        index_key = f'{settings.TOKEN_SESSION_INDEX_REDIS_PREFIX}:{user_id}'
+        pipe.zremrangebyscore(index_key, '-inf', int(time.time()))
+        pipe.zadd(index_key, {family_id: int(refresh_token.refresh_token_expire_time.timestamp())})
+        pipe.expire(index_key, settings.TOKEN_REFRESH_EXPIRE_SECONDS)
+
+    async def create_new_token(self, user_id: str, token: RefreshToken, family_id: str | None, **kwargs) -> Token:
+        """
+        Rotate a refresh token, issuing the next refresh token of its family and a new access token
+
+        :param user_id: User id
+        :param token: Presented refresh token
+        :param family_id: Token family of the presented refresh token, None for tokens issued before families
+        :param kwargs: Additional token information
+        :return:
+        """
+        # Encode the replacement tokens first, then rotate atomically in a single round trip
+        new_family_id = family_id or uuid4().hex
+        access_token = self._encode_access_token(str(user_id), new_family_id)
+        refresh_token = self._encode_refresh_token(str(user_id), new_family_id)
+        digest = self._refresh_token_digest(token.refresh_token)
+        result, replaced_session_uuid = await self._rotate_refresh_token(
+            keys=[
+                f'{settings.TOKEN_REFRESH_FAMILY_REDIS_PREFIX}:{user_id}:{new_family_id}',
+                f'{settings.TOKEN_REDIS_PREFIX}:{user_id}:{access_token.session_uuid}',
+                f'{settings.TOKEN_SESSION_INDEX_REDIS_PREFIX}:{user_id}',
+                f'{settings.TOKEN_REFRESH_INDEX_REDIS_PREFIX}:{user_id}',
+                f'{settings.TOKEN_EXTRA_INFO_REDIS_PREFIX}:{access_token.session_uuid}',
+                # Refresh tokens issued before token families, keyed by digest or by the full token
+                f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{user_id}:{digest}',
+                f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{user_id}:{token.refresh_token}',
+            ],
+            args=[
+                int(time.time()),
+                digest,
+                self._refresh_token_digest(refresh_token.refresh_token),
+                settings.TOKEN_REFRESH_EXPIRE_SECONDS,
+                int(refresh_token.refresh_token_expire_time.timestamp()),
+                new_family_id,
+                access_token.access_token,
+                self.access_token_expire_seconds,
+                access_token.session_uuid,
+                json.dumps(kwargs, ensure_ascii=False) if kwargs else '',
+                family_id or '',
+                token.refresh_token,
+                f'{settings.TOKEN_REDIS_PREFIX}:{user_id}',
+                settings.TOKEN_EXTRA_INFO_REDIS_PREFIX,
+            ],
+        )
+        if result == -1:
+            # A rotated refresh token was used again, assume it leaked and end every session
+            log.warning(f'Refresh token reuse detected for user {user_id}')
+            await self.revoke_all_tokens(user_id)
+            raise TokenError(msg='Refresh token has already been used, please log in again')
+        if result != 1:
             raise TokenError(msg='Refresh token has expired, please log in again')
-        access_token = await self._create_access_token(user_id, **kwargs)
-        return Token(access_token=access_token, refresh_token=token)
+        # The replaced access token is gone from redis, drop it from the verified caches as well
+        if replaced_session_uuid:
+            await self._publish_revocation(f'{user_id}:{replaced_session_uuid}')
+        return Token(access_token=access_token, refresh_token=refresh_token)
     
     def get_token(self,request: Request) -> str:
         authorization = request.headers.get('Authorization')
@@ -108,9 +415,87 @@ class JWTToken:
             raise TokenError(msg='Invalid token')
         return token
 
-    async def revoke_token(self,user_id: str, session_uuid: str) -> None:
-        token_key = f'{settings.TOKEN_REDIS_PREFIX}:{user_id}:{session_uuid}'
-        await redis.delete(token_key)
+    async def revoke_token(self, user_id: str, session_uuid: str, family_id: str | None = None) -> None:
+        """
+        Revoke a session: its access token and, when known, its token family
+
+        :param user_id: User id
+        :param session_uuid: Session uuid of the access token
+        :param family_id: Token family of the session, None for tokens issued before families
+        :return:
+        """
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(
+                f'{settings.TOKEN_REDIS_PREFIX}:{user_id}:{session_uuid}',
+                f'{settings.TOKEN_EXTRA_INFO_REDIS_PREFIX}:{session_uuid}',
+            )
+            if family_id:
+                pipe.delete(f'{settings.TOKEN_REFRESH_FAMILY_REDIS_PREFIX}:{user_id}:{family_id}')
+            pipe.zrem(f'{settings.TOKEN_SESSION_INDEX_REDIS_PREFIX}:{user_id}', family_id or session_uuid)
+            await pipe.execute()
+        await self._publish_revocation(f'{user_id}:{session_uuid}')
+
+    async def revoke_refresh_token(self, user_id: str, refresh_token: str) -> None:
+        try:
+            family_id = self.jwt_decode(refresh_token).family_id
+        except TokenError:
+            # Expired or invalid, so there is nothing left to revoke
+            return
+        digest = self._refresh_token_digest(refresh_token)
+        async with redis.pipeline(transaction=True) as pipe:
+            if family_id:
+                pipe.delete(f'{settings.TOKEN_REFRESH_FAMILY_REDIS_PREFIX}:{user_id}:{family_id}')
+                pipe.zrem(f'{settings.TOKEN_SESSION_INDEX_REDIS_PREFIX}:{user_id}', family_id)
+            else:
+                pipe.delete(
+                    f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{user_id}:{digest}',
+                    f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{user_id}:{refresh_token}',
+                )
+                pipe.zrem(f'{settings.TOKEN_REFRESH_INDEX_REDIS_PREFIX}:{user_id}', digest)
+            await pipe.execute()
+
+    async def get_sessions(self, user_id: str) -> list[TokenSession]:
+        """
+        List the active sessions of a user from the session index, dropping stale entries
+
+        Sessions are identified by their token family, which stays the same across refreshes.
+
+        :param user_id: User id
+        :return:
+        """
+        index_key = f'{settings.TOKEN_SESSION_INDEX_REDIS_PREFIX}:{user_id}'
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(index_key, '-inf', int(time.time()))
+            pipe.zrange(index_key, 0, -1, withscores=True)
+            _, sessions = await pipe.execute()
+        return [
+            TokenSession(session_uuid=session_uuid, expire_time=timezone.from_timestamp(expire_time))
+            for session_uuid, expire_time in sessions
+        ]
+
+    async def revoke_all_tokens(self, user_id: str) -> None:
+        """
+        Revoke every access and refresh token of a user without scanning the keyspace
+
+        A single script reads the indexes and deletes the tokens, so a session created or
+        refreshed concurrently cannot slip in between.
+
+        :param user_id: User id
+        :return:
+        """
+        session_uuids = await self._revoke_all_tokens(
+            keys=[
+                f'{settings.TOKEN_SESSION_INDEX_REDIS_PREFIX}:{user_id}',
+                f'{settings.TOKEN_REFRESH_INDEX_REDIS_PREFIX}:{user_id}',
+            ],
+            args=[
+                f'{settings.TOKEN_REDIS_PREFIX}:{user_id}',
+                settings.TOKEN_EXTRA_INFO_REDIS_PREFIX,
+                f'{settings.TOKEN_REFRESH_FAMILY_REDIS_PREFIX}:{user_id}',
+                f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:{user_id}',
+            ],
+        )
+        await self._publish_revocation(*(f'{user_id}:{session_uuid}' for session_uuid in session_uuids))
 
     async def verify_auth_user(self,request: Request) -> TokenPayload | None:
         token = self.get_token(request)
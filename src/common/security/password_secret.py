@@ -1,16 +1,151 @@
+import asyncio
+import hashlib
+import math
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
 
+import bcrypt
 from pwdlib import PasswordHash
 from pwdlib.hashers.bcrypt import BcryptHasher
 
+from src.common.exception import errors
+from src.common.log import log
+from src.core.settings import settings
+from src.database.redis import redis
+
+
+def _hash_rounds(hashed_password: str) -> int:
+    # bcrypt hashes look like $2b$<cost>$<salt and digest>
+    try:
+        return int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _hardware_id() -> str:
+    """
+    Short id of the CPU model and core count, shared by hosts that hash at the same speed
+    """
+    model = platform.processor() or platform.machine()
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            model = next((line.split(':', 1)[1].strip() for line in cpuinfo if line.startswith('model name')), model)
+    except OSError:
+        pass
+    return hashlib.blake2b(f'{model}:{os.cpu_count()}'.encode(), digest_size=8).hexdigest()
+
+
 class PasswordSecret:
     def __init__(self) -> None:
-        self.password_hash = PasswordHash((BcryptHasher(),))
+        self.rounds = settings.PASSWORD_HASH_ROUNDS
+        self.password_hash = PasswordHash((BcryptHasher(rounds=self.rounds),))
+        # bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix='password-hash',
+        )
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.rejected = 0
+
+    def _set_rounds(self, rounds: int) -> None:
+        self.rounds = rounds
+        self.password_hash = PasswordHash((BcryptHasher(rounds=rounds),))
+
+    def _measure_rounds(self) -> int:
+        """
+        Time a verification at the minimum cost and extrapolate the cost that fits the target time
+        """
+        min_rounds = settings.PASSWORD_HASH_MIN_ROUNDS
+        hashed = bcrypt.hashpw(b'calibration', bcrypt.gensalt(min_rounds))
+        elapsed = math.inf
+        for _ in range(3):
+            start_time = time.perf_counter()
+            bcrypt.checkpw(b'calibration', hashed)
+            elapsed = min(elapsed, time.perf_counter() - start_time)
+
+        # Every extra round doubles the work
+        rounds = min_rounds + int(math.log2(settings.PASSWORD_HASH_TARGET_MS / 1000 / elapsed))
+        return max(min_rounds, min(settings.PASSWORD_HASH_MAX_ROUNDS, rounds))
+
+    async def calibrate(self) -> int:
+        """
+        Pick the bcrypt cost that hits the target verification time on this hardware
+
+        The first worker to calibrate on a CPU model shares its result through redis, so workers
+        on the same hardware hash with the same cost and logins do not keep rehashing between
+        them. Other hardware calibrates for itself, and the result expires so a host is measured
+        again after the fleet changes.
+        """
+        key = f'{settings.PASSWORD_HASH_ROUNDS_REDIS_KEY}:{_hardware_id()}'
+        rounds = await redis.get(key)
+        if rounds is None:
+            measured = await asyncio.get_running_loop().run_in_executor(self._executor, self._measure_rounds)
+            await redis.set(key, measured, ex=settings.PASSWORD_HASH_CALIBRATION_EXPIRE_SECONDS, nx=True)
+            rounds = await redis.get(key) or measured
+        self._set_rounds(int(rounds))
+        log.info(f'Password hash cost set to {self.rounds} rounds')
+        return self.rounds
+
+    def gen_salt(self) -> bytes:
+        return bcrypt.gensalt(self.rounds)
 
     def get_hash_password(self,password: str, salt: bytes | None) -> str:
         return self.password_hash.hash(password, salt=salt)
 
     def password_verify(self,plain_password: str, hashed_password: str) -> bool:
         return self.password_hash.verify(plain_password, hashed_password)
-    
 
-password_secret: PasswordSecret = PasswordSecret()
\ No newline at end of file
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run blocking hash work on the bounded pool, rejecting new work when the queue is full
+        """
+        if self.queue_depth >= settings.PASSWORD_HASH_MAX_QUEUE:
+            self.rejected += 1
+            raise errors.HTTPError(code=503, msg='Server is busy, please try again later', headers={'Retry-After': '1'})
+
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+        finally:
+            self.queue_depth -= 1
+
+    async def hash_password(self, password: str, salt: bytes | None) -> str:
+        return await self._run(self.get_hash_password, password, salt)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.password_verify, plain_password, hashed_password)
+
+    def password_verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        valid, updated_hash = self.password_hash.verify_and_update(plain_password, hashed_password)
+        # Only strengthen hashes, a lower configured cost must not rewrite stronger ones
+        if updated_hash is not None and _hash_rounds(hashed_password) >= self.rounds:
+            updated_hash = None
+        return valid, updated_hash
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Verify a password and return a new hash when the stored hash is cheaper than the current cost
+        """
+        return await self._run(self.password_verify_and_update, plain_password, hashed_password)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'rounds': self.rounds,
+            'workers': settings.PASSWORD_HASH_WORKERS,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'max_queue': settings.PASSWORD_HASH_MAX_QUEUE,
+            'rejected': self.rejected,
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+password_secret: PasswordSecret = PasswordSecret()
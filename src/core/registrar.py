@@ -12,6 +12,14 @@ from src.database.redis import redis
 from src.core.settings import settings
 from src.database.db import db
 from src.common.log import log
+from src.common.security.jwt import jwt_token
+from src.common.security.password_secret import password_secret
+from src.utils.ip2region import ip2region
+from src.utils.ip_api import ip_api
+from src.utils.request_parser import request_parser
+from src.utils.tasks import wait_for_background_tasks
+from src.backend.catalog.search_index import catalog_search_index
+from src.backend.catalog.service import catalog_service
 from src.backend.routes import router 
 from src.backend.root.root import router as root_router 
 
@@ -30,8 +38,51 @@ class Registrar:
         # Set the rate limiter
         await FastAPILimiter.init(redis=redis,prefix=settings.REQUEST_LIMITER_REDIS_PREFIX,http_callback=http_limit_callback)
 
+        # Map the offline ip location database
+        if settings.IP_LOCATION_PARSE != 'false':
+            ip2region.open()
+
+        # Open the pooled online ip location client
+        if settings.IP_LOCATION_PARSE == 'online':
+            await ip_api.open()
+
+        # Pre-warm the user agent cache with the known app user agents
+        request_parser.prewarm_user_agents(settings.USER_AGENT_PREWARM)
+
+        # Calibrate the password hash cost for this hardware
+        if settings.PASSWORD_HASH_CALIBRATE:
+            await password_secret.calibrate()
+
+        # Build the in-memory catalog search index
+        if settings.CATALOG_SEARCH_INDEX:
+            await catalog_search_index.sync()
+
+        # Listen for token revocations from other workers
+        await jwt_token.start_revocation_listener()
+
+        # Drop tombstones older than the oldest version clients can sync from
+        catalog_service.start_tombstone_pruning()
+
         yield
 
+        # Stop pruning catalog tombstones
+        await catalog_service.stop_tombstone_pruning()
+
+        # Stop listening for token revocations
+        await jwt_token.stop_revocation_listener()
+
+        # Close the online ip location client
+        await ip_api.close()
+
+        # Unmap the offline ip location database
+        ip2region.close()
+
+        # Shut down the password hash pool
+        password_secret.close()
+
+        # Finish pending cache writes and catalog version bumps
+        await wait_for_background_tasks()
+
         # Close redis connection
         await redis.close()
 
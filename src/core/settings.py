@@ -70,25 +70,96 @@ class Settings(BaseSettings):
     TOKEN_SECRET_KEY: str 
     TOKEN_ALGORITHM: str = 'HS256'
     TOKEN_EXPIRE_SECONDS: int = 60 * 60 * 24  # 1 day
+    TOKEN_STATELESS: bool = False  # Verify access tokens by signature and a revocation filter, without redis
+    TOKEN_STATELESS_EXPIRE_SECONDS: int = 60 * 5  # Access token lifetime in stateless mode
+    TOKEN_REVOKED_REDIS_KEY: str = 'swipewise:token_revoked'
+    TOKEN_REVOKED_SYNC_SECONDS: int = 10
+    TOKEN_REVOKED_FILTER_CAPACITY: int = 100000
+    TOKEN_REVOKED_FILTER_ERROR_RATE: float = 0.001
     TOKEN_REFRESH_EXPIRE_SECONDS: int = 60 * 60 * 24 * 7  # 7 days
     TOKEN_REDIS_PREFIX: str = 'swipewise:token'
     TOKEN_EXTRA_INFO_REDIS_PREFIX: str = 'swipewise:token_extra_info'
     TOKEN_ONLINE_REDIS_PREFIX: str = 'swipewise:token_online'
-    TOKEN_REFRESH_REDIS_PREFIX: str = 'swipewise:refresh_token'
+    TOKEN_REFRESH_REDIS_PREFIX: str = 'swipewise:refresh_token'  # Refresh tokens issued before token families
+    TOKEN_REFRESH_FAMILY_REDIS_PREFIX: str = 'swipewise:refresh_token_family'
+    TOKEN_SESSION_INDEX_REDIS_PREFIX: str = 'swipewise:token_sessions'  # Token families of each user
+    TOKEN_REFRESH_INDEX_REDIS_PREFIX: str = 'swipewise:refresh_token_sessions'  # Tokens issued before families
+    TOKEN_REVOKE_CHANNEL: str = 'swipewise:token_revoke'
+    TOKEN_LOCAL_CACHE_MAXSIZE: int = 10000
+    TOKEN_LOCAL_CACHE_EXPIRE_SECONDS: int = 60 * 5
+
+    # Password Hash Settings
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # In-flight and queued hashes before rejecting with 503
+    PASSWORD_HASH_ROUNDS: int = 12  # Used when calibration is disabled
+    PASSWORD_HASH_CALIBRATE: bool = True
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 10
+    PASSWORD_HASH_MAX_ROUNDS: int = 15
+    PASSWORD_HASH_ROUNDS_REDIS_KEY: str = 'swipewise:password_hash:rounds'  # Per CPU model, delete to recalibrate
+    PASSWORD_HASH_CALIBRATION_EXPIRE_SECONDS: int = 60 * 60 * 24
+
+    # Monitor Settings
+    MONITOR_AUTH_REQUIRED: bool = True  # Only authenticated users may read the worker statistics
 
     # Exclude path from authrorization
-    TOKEN_REQUEST_PATH_EXCLUDE: list[str] = [
+    TOKEN_REQUEST_PATH_EXCLUDE: list[str] = [  # '/exact', '/prefix/*' or '/path/{param}', optionally 'GET /path'
         f'{FASTAPI_API_V1_PATH}/auth/login', 
         f'{FASTAPI_API_V1_PATH}/auth/guest_login', 
         f'{FASTAPI_API_V1_PATH}/auth/register',
         f'{FASTAPI_API_V1_PATH}/auth/forgot_password',
-        f'{FASTAPI_API_V1_PATH}/card/search'
+        f'{FASTAPI_API_V1_PATH}/catalog/changes',
+        f'{FASTAPI_API_V1_PATH}/card/filter',
+        f'{FASTAPI_API_V1_PATH}/card/list',
+        f'{FASTAPI_API_V1_PATH}/card/list/cursor',
+        f'{FASTAPI_API_V1_PATH}/card/search',
+        f'{FASTAPI_API_V1_PATH}/card/suggest',
+        f'{FASTAPI_API_V1_PATH}/bank/list',
+        f'{FASTAPI_API_V1_PATH}/bank/list/cursor',
+        f'{FASTAPI_API_V1_PATH}/bank/search',
     ]
 
     # IP Location Settings
     IP_LOCATION_PARSE: Literal['online', 'offline', 'false'] = 'offline'
     IP_LOCATION_REDIS_PREFIX: str = 'swipewise:ip:location'
     IP_LOCATION_EXPIRE_SECONDS: int = 60 * 60 * 24  
+    IP_LOCATION_LOCAL_CACHE_MAXSIZE: int = 10000
+    IP_LOCATION_LOCAL_EXPIRE_SECONDS: int = 60 * 10
+    IP_LOCATION_ONLINE_URL: str = 'http://ip-api.com/json'
+    IP_LOCATION_ONLINE_TIMEOUT: float = 3
+    IP_LOCATION_ONLINE_MAX_CONNECTIONS: int = 10
+    IP_LOCATION_ONLINE_FAILURE_THRESHOLD: int = 5
+    IP_LOCATION_ONLINE_RECOVERY_SECONDS: int = 30
+
+    # Pagination Settings
+    PAGINATION_COUNT_REDIS_PREFIX: str = 'swipewise:pagination:count'
+    PAGINATION_COUNT_EXPIRE_SECONDS: int = 60 * 5
+    PAGINATION_COUNT_ESTIMATE_THRESHOLD: int = 100000
+    PAGINATION_COUNT_ESTIMATE_CACHE_MAXSIZE: int = 1000
+
+    # Catalog Response Cache Settings
+    CATALOG_CACHE_ENABLED: bool = True
+    CATALOG_CACHE_REDIS_PREFIX: str = 'swipewise:catalog:response'
+    CATALOG_CACHE_EXPIRE_SECONDS: int = 60 * 60
+    CATALOG_VERSION_REDIS_KEY: str = 'swipewise:catalog:version'
+    CATALOG_VERSION_TIMES_REDIS_KEY: str = 'swipewise:catalog:version_times'
+
+    # Catalog Delta Sync Settings
+    CATALOG_CHANGES_RETENTION_SECONDS: int = 60 * 60 * 24 * 30  # Older versions get a full snapshot
+    CATALOG_CHANGES_OVERLAP_SECONDS: int = 60  # Re-send rows written this much before the client's version
+    CATALOG_TOMBSTONE_PRUNE_SECONDS: int = 60 * 60
+
+    # Catalog Search Index Settings
+    CATALOG_SEARCH_INDEX: bool = True  # Serve card and bank searches from an in-memory index
+    CATALOG_SEARCH_SYNC_OVERLAP_SECONDS: int = 60  # Re-read rows this much older than the last sync
+    CATALOG_SEARCH_VERSION_CHECK_SECONDS: float = 1  # Uncached searches and suggestions may lag this much
+    CATALOG_SUGGEST_MAX_DISTANCE: int = 1  # Typos tolerated per typed word
+    CATALOG_SUGGEST_LIMIT: int = 8
+
+    # User Agent Settings
+    USER_AGENT_CACHE_MAXSIZE: int = 1024
+    USER_AGENT_CACHE_EXPIRE_SECONDS: int = 60 * 60 * 24
+    USER_AGENT_PREWARM: list[str] = []  # Known app user agents parsed at startup
 
     # CORS Settings
     CORS_ALLOWED_ORIGINS: list[str] = [
@@ -0,0 +1,41 @@
+import time
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.common.log import log
+from src.utils.request_context import get_request_context
+
+
+class AccessMiddleware:
+    """Access log middleware"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            request = Request(scope)
+            path = request.url.path
+            if request.url.query:
+                path = f'{path}?{request.url.query}'
+            log.info(
+                f'{get_request_context(request).ip: <15} | {request.method: <8} | {status_code: <6} | '
+                f'{path} | {elapsed:.3f}ms'
+            )
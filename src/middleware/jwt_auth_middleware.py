@@ -9,6 +9,7 @@ from src.common.log import log
 from src.common.exception.errors import TokenError
 from src.common.security.jwt import jwt_token
 from src.core.settings import settings
+from src.utils.path_matcher import PathMatcher
 from src.utils.serializers import MsgSpecJSONResponse
 
 
@@ -34,6 +35,9 @@ class _AuthenticationError(AuthenticationError):
 class JwtAuthMiddleware(AuthenticationBackend):
     """JWT authentication middleware"""
 
+    def __init__(self) -> None:
+        self.exclude_matcher = PathMatcher(settings.TOKEN_REQUEST_PATH_EXCLUDE)
+
     @staticmethod
     def auth_exception_handler(conn: HTTPConnection, exc: _AuthenticationError) -> Response:
         """
@@ -52,11 +56,11 @@ class JwtAuthMiddleware(AuthenticationBackend):
         :param request: FastAPI request object
         :return:
         """
-        token = request.headers.get('Authorization')
-        if not token:
+        if self.exclude_matcher.match(request.url.path, request.scope.get('method', '')):
             return None
 
-        if request.url.path in settings.TOKEN_REQUEST_PATH_EXCLUDE:
+        token = request.headers.get('Authorization')
+        if not token:
             return None
 
         scheme, token = get_authorization_scheme_param(token)
@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.authentication import AuthenticationMiddleware
 
 from src.core.settings import settings
+from src.middleware.access_middleware import AccessMiddleware
 from src.middleware.jwt_auth_middleware import JwtAuthMiddleware
 from src.middleware.state_middleware import StateMiddleware
 
@@ -18,6 +19,9 @@ class Middleware:
         
         app.add_middleware(StateMiddleware)
 
+        if settings.MIDDLEWARE_ACCESS:
+            app.add_middleware(AccessMiddleware)
+
         app.add_middleware(CorrelationIdMiddleware, validator=False)
 
         app.add_middleware(
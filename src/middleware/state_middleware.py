@@ -1,26 +1,22 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from src.utils.request_parser import request_parser
+from src.utils.request_context import RequestContext
 
 
-class StateMiddleware(BaseHTTPMiddleware):
-    """Request state middleware for parsing and setting additional request information"""
+class StateMiddleware:
+    """Request state middleware for attaching the lazily parsed request information"""
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        ip_info = await request_parser.parse_ip_info(request)
-        ua_info = request_parser.parse_user_agent_info(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        # Set additional request information
-        request.state.ip = ip_info.ip
-        request.state.country = ip_info.country
-        request.state.region = ip_info.region
-        request.state.city = ip_info.city
-        request.state.user_agent = ua_info.user_agent
-        request.state.os = ua_info.os
-        request.state.browser = ua_info.browser
-        request.state.device = ua_info.device
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        # Geolocation and user agent are resolved on first access only
+        request = Request(scope)
+        request.state.context = RequestContext(request)
 
-        return response
\ No newline at end of file
+        await self.app(scope, receive, send)
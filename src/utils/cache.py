@@ -0,0 +1,61 @@
+from typing import Any, Hashable
+
+from cachetools import TLRUCache
+
+from src.common.data_classes import CacheStats
+
+
+class _CountingTLRUCache(TLRUCache):
+    """TLRU cache that counts capacity evictions"""
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize=maxsize, ttu=lambda key, value, now: value[1])
+        self.evictions = 0
+
+    def popitem(self) -> tuple[Any, Any]:
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry and hit/miss/eviction counters
+
+    Entries expire after ``ttl`` seconds unless a shorter ``ttl`` is given when setting them.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.ttl = ttl
+        self._cache = _CountingTLRUCache(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._cache[key] = (value, self._cache.timer() + ttl)
+
+    def delete(self, key: Hashable) -> None:
+        self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.misses
+        return CacheStats(
+            size=self._cache.currsize,
+            maxsize=self._cache.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self._cache.evictions,
+            hit_rate=round(self.hits / lookups, 4) if lookups else 0.0,
+        )
@@ -0,0 +1,60 @@
+import time
+from typing import Literal
+
+from src.common.log import log
+
+
+class CircuitBreaker:
+    """
+    Simple consecutive-failure circuit breaker
+
+    After ``failure_threshold`` consecutive failures the breaker opens and callers should fail
+    fast for ``recovery_timeout`` seconds. A single trial call is then let through (half-open);
+    its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> Literal['closed', 'open', 'half_open']:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """
+        Let another trial call through when the current one ended without an outcome, e.g. cancelled
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            log.info(f'Circuit breaker {self.name} closed')
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                log.warning(f'Circuit breaker {self.name} opened after {self.failures} failures')
+            self.opened_at = time.monotonic()
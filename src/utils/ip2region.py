@@ -0,0 +1,90 @@
+import mmap
+import os
+from typing import Iterable, Optional
+
+from ip2loc import XdbSearcher
+
+from src.common.log import log
+from src.core.path_config import path_config
+
+
+class Ip2Region:
+    """
+    Process-wide offline IP location engine
+
+    The xdb file is memory-mapped read-only once at startup, so every uvicorn worker
+    shares the same page cache pages instead of reading its own copy of the file.
+    """
+
+    def __init__(self, dbfile: str | os.PathLike = path_config.ip2region__xdb) -> None:
+        self.dbfile = dbfile
+        self._file = None
+        self._buffer: mmap.mmap | None = None
+        self._searcher: XdbSearcher | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._searcher is not None
+
+    def open(self) -> None:
+        """
+        Memory-map the xdb file and create the shared searcher
+        """
+        if self.is_open:
+            return
+        try:
+            self._file = open(self.dbfile, 'rb')
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._searcher = XdbSearcher(contentBuff=self._buffer)
+        except Exception as e:
+            log.warning(f'Offline IP database could not be loaded from {self.dbfile}: {str(e)}')
+            self.close()
+
+    def close(self) -> None:
+        if self._searcher is not None:
+            self._searcher.close()
+            self._searcher = None
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def lookup(self, ip: str) -> Optional[dict]:
+        """
+        Get IP address location from the mapped xdb file
+
+        :param ip: IPv4 address
+        :return:
+        """
+        if self._searcher is None:
+            return None
+
+        try:
+            data = self._searcher.search(ip)
+        except Exception as e:
+            log.warning(f'Offline IP lookup failed for {ip}: {str(e)}')
+            return None
+
+        if not data:
+            return None
+
+        data = data.split('|')
+        return {
+            'country': data[0] if data[0] != '0' else None,
+            'regionName': data[2] if data[2] != '0' else None,
+            'city': data[3] if data[3] != '0' else None,
+        }
+
+    def lookup_many(self, ips: Iterable[str]) -> dict[str, Optional[dict]]:
+        """
+        Bulk lookup of IP address locations
+
+        :param ips: IPv4 addresses
+        :return:
+        """
+        return {ip: self.lookup(ip) for ip in ips}
+
+
+ip2region: Ip2Region = Ip2Region()
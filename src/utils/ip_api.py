@@ -0,0 +1,87 @@
+from typing import Optional
+
+import httpx
+
+from src.common.log import log
+from src.core.settings import settings
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.singleflight import SingleFlight
+
+
+class IpApiClient:
+    """
+    Pooled online IP location client
+
+    One long-lived connection pool is shared for all lookups, concurrent lookups of the same IP
+    are deduplicated, and a circuit breaker fails fast while the upstream is slow or down.
+    """
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+        self._singleflight = SingleFlight()
+        self.breaker = CircuitBreaker(
+            name='ip-api',
+            failure_threshold=settings.IP_LOCATION_ONLINE_FAILURE_THRESHOLD,
+            recovery_timeout=settings.IP_LOCATION_ONLINE_RECOVERY_SECONDS,
+        )
+
+    async def open(self) -> None:
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=settings.IP_LOCATION_ONLINE_URL,
+            timeout=settings.IP_LOCATION_ONLINE_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.IP_LOCATION_ONLINE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.IP_LOCATION_ONLINE_MAX_CONNECTIONS,
+            ),
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def lookup(self, ip: str, user_agent: str | None) -> Optional[dict]:
+        """
+        Get IP address location online, returns None when the upstream is unavailable
+
+        :param ip: IPv4 address
+        :param user_agent: User agent forwarded to the upstream
+        :return:
+        """
+        if self._client is None or not self.breaker.allow_request():
+            return None
+        trial = self.breaker.state != 'closed'
+        try:
+            return await self._singleflight.do(ip, lambda: self._fetch(ip, user_agent))
+        finally:
+            # A cancelled trial records no outcome and would keep the breaker from ever closing
+            if trial:
+                self.breaker.release_trial()
+
+    async def _fetch(self, ip: str, user_agent: str | None) -> Optional[dict]:
+        headers = {'User-Agent': user_agent or 'Mozilla/5.0'}
+        try:
+            response = await self._client.get(f'/{ip}', params={'lang': 'zh-CN'}, headers=headers)
+        except Exception as e:
+            self.breaker.record_failure()
+            log.warning(f'Online IP lookup failed for {ip}: {str(e)}')
+            return None
+
+        if response.status_code != 200:
+            self.breaker.record_failure()
+            log.warning(f'Online IP lookup failed for {ip}: HTTP {response.status_code}')
+            return None
+
+        self.breaker.record_success()
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        if data.get('status') == 'success':
+            return data
+        return None
+
+
+ip_api: IpApiClient = IpApiClient()
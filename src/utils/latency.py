@@ -0,0 +1,21 @@
+from collections import deque
+
+
+class LatencySampler:
+    """Keeps the most recent latency samples and reports percentiles in milliseconds"""
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        self._samples: deque[float] = deque(maxlen=maxlen)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds * 1000)
+
+    def percentile(self, percent: float) -> float:
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+        return round(samples[index], 3)
+
+    def summary(self) -> dict[str, float]:
+        return {'p50': self.percentile(50), 'p99': self.percentile(99)}
@@ -0,0 +1,84 @@
+from typing import Iterable
+
+
+class _Node:
+    __slots__ = ('children', 'param', 'terminal', 'wildcard')
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.param: _Node | None = None
+        self.terminal = False
+        self.wildcard = False
+
+
+class PathMatcher:
+    """
+    Segment trie for URL path patterns, compiled once and matched in O(path length)
+
+    Supported patterns:
+        ``/api/v1/auth/login`` exact path
+        ``/api/v1/catalog/*`` the prefix and any path below it
+        ``/api/v1/card/{card_id}`` a single parameterized segment
+
+    Any of them may be prefixed with a method, like ``GET /api/v1/card/{card_id}``, to match
+    only requests of that method; unprefixed patterns match every method
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self._roots: dict[str, _Node] = {}
+        for pattern in patterns:
+            self.add(pattern)
+
+    @staticmethod
+    def _segments(path: str) -> list[str]:
+        return [segment for segment in path.split('/') if segment]
+
+    def add(self, pattern: str) -> None:
+        method, _, path = pattern.strip().rpartition(' ')
+        node = self._roots.setdefault(method.upper(), _Node())
+        for segment in self._segments(path):
+            if segment == '*':
+                node.wildcard = True
+                return
+            if segment.startswith('{') and segment.endswith('}'):
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _Node())
+        node.terminal = True
+
+    def match(self, path: str, method: str = '') -> bool:
+        """
+        Whether the path matches one of the patterns
+
+        :param path: URL path
+        :param method: Request method, only method-less patterns apply when omitted
+        :return:
+        """
+        segments = self._segments(path)
+        for key in ('', method.upper()) if method else ('',):
+            root = self._roots.get(key)
+            if root is not None and self._match(root, segments, 0):
+                return True
+        return False
+
+    def _match(self, node: _Node, segments: list[str], index: int) -> bool:
+        while True:
+            if node.wildcard:
+                return True
+            if index == len(segments):
+                return node.terminal
+            child = node.children.get(segments[index])
+            if child is None:
+                if node.param is None:
+                    return False
+                child = node.param
+            elif node.param is not None and self._match(node.param, segments, index + 1):
+                # Literal and parameter branches are rare together, only then backtrack
+                return True
+            node = child
+            index += 1
+
+    def __contains__(self, path: str) -> bool:
+        return self.match(path)
@@ -0,0 +1,71 @@
+from functools import cached_property
+
+from fastapi import Request
+
+from src.common.data_classes import IpInfo, RequestContextStats, UserAgentInfo
+from src.utils.request_parser import request_parser
+
+# Process-wide counters of how often lazy enrichment was actually needed
+request_context_stats: RequestContextStats = RequestContextStats()
+
+
+class RequestContext:
+    """
+    Lazily enriched request information
+
+    Geolocation and User-Agent details are only resolved on first access and memoized for the
+    rest of the request, so routes that never read them pay nothing.
+    """
+
+    def __init__(self, request: Request) -> None:
+        self._request = request
+        self._ip_info: IpInfo | None = None
+        request_context_stats.requests += 1
+
+    @cached_property
+    def ip(self) -> str:
+        return request_parser.get_request_ip(self._request)
+
+    async def get_ip_info(self) -> IpInfo:
+        """
+        Resolve the request geolocation once per request
+        """
+        if self._ip_info is None:
+            request_context_stats.ip_enrichments += 1
+            self._ip_info = await request_parser.parse_ip_info(self._request)
+        return self._ip_info
+
+    @cached_property
+    def user_agent_info(self) -> UserAgentInfo:
+        request_context_stats.user_agent_enrichments += 1
+        return request_parser.parse_user_agent_info(self._request)
+
+    @property
+    def user_agent(self) -> str:
+        return self.user_agent_info.user_agent
+
+    @property
+    def os(self) -> str | None:
+        return self.user_agent_info.os
+
+    @property
+    def browser(self) -> str | None:
+        return self.user_agent_info.browser
+
+    @property
+    def device(self) -> str | None:
+        return self.user_agent_info.device
+
+
+def get_request_context(request: Request) -> RequestContext:
+    """
+    Get the lazy request context set by the state middleware
+
+    :param request: FastAPI request object
+    :return:
+    """
+    context = getattr(request.state, 'context', None)
+    if context is None:
+        context = RequestContext(request)
+        request.state.context = context
+    return context
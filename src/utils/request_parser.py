@@ -1,17 +1,26 @@
-import httpx
-from asgiref.sync import sync_to_async
 from fastapi import Request
-from ip2loc import XdbSearcher
 from user_agents import parse
 from typing import Optional
 
 from src.common.data_classes import IpInfo, UserAgentInfo
 from src.common.log import log
 from src.core.settings import settings
-from src.core.path_config import path_config
 from src.database.redis import redis
+from src.utils.cache import LocalCache
+from src.utils.ip2region import ip2region
+from src.utils.ip_api import ip_api
+from src.utils.tasks import run_in_background
 
 class RequestParser:
+    def __init__(self) -> None:
+        self.ip_cache = LocalCache(
+            maxsize=settings.IP_LOCATION_LOCAL_CACHE_MAXSIZE,
+            ttl=settings.IP_LOCATION_LOCAL_EXPIRE_SECONDS,
+        )
+        self.ua_cache = LocalCache(
+            maxsize=settings.USER_AGENT_CACHE_MAXSIZE,
+            ttl=settings.USER_AGENT_CACHE_EXPIRE_SECONDS,
+        )
 
     def get_request_ip(self, request: Request) -> str:
         """
@@ -58,65 +67,48 @@ class RequestParser:
 
     async def get_location_online(self, ip: str, user_agent: str) -> Optional[dict]:
         """
-        Get IP address location online with proper error handling
+        Get IP address location online, falling back to offline while the upstream is unavailable
         """
         if not self._is_valid_ip(ip) or ip == '0.0.0.0':
             return None
 
-        async with httpx.AsyncClient(timeout=3) as client:
-            ip_api_url = f'http://ip-api.com/json/{ip}?lang=zh-CN'
-            headers = {'User-Agent': user_agent or 'Mozilla/5.0'}
-            try:
-                response = await client.get(ip_api_url, headers=headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('status') == 'success':
-                        return data
-            except Exception as e:
-                log.warning(f'Online IP lookup failed for {ip}: {str(e)}')
-            return None
+        location_info = await ip_api.lookup(ip, user_agent)
+        if location_info is None and ip_api.breaker.state != 'closed':
+            return self.get_location_offline(ip)
+        return location_info
 
-    @sync_to_async
     def get_location_offline(self, ip: str) -> Optional[dict]:
         """
-        Get IP address location offline with robust error handling
+        Get IP address location offline from the shared memory-mapped xdb searcher
         """
         if not self._is_valid_ip(ip) or ip == '0.0.0.0':
             return None
 
-        try:
-            cb = XdbSearcher.loadContentFromFile(dbfile=path_config.ip2region__xdb)
-            searcher = XdbSearcher(contentBuff=cb)
-            data = searcher.search(ip)
-            searcher.close()
-            
-            if not data:
-                return None
-                
-            data = data.split('|')
-            return {
-                'country': data[0] if data[0] != '0' else None,
-                'regionName': data[2] if data[2] != '0' else None,
-                'city': data[3] if data[3] != '0' else None,
-            }
-        except Exception as e:
-            log.warning(f'Offline IP lookup failed for {ip}: {str(e)}')
-            return None
+        return ip2region.lookup(ip)
 
     async def parse_ip_info(self, request: Request) -> IpInfo:
         """
-        Parse IP information with caching and fallback logic
+        Parse IP information with a local LRU tier in front of the Redis cache and fallback logic
         """
         ip = self.get_request_ip(request)
-        
-        # Check cache first
+        if ip == '0.0.0.0':
+            return IpInfo(ip=ip, country=None, region=None, city=None)
+
+        # Check the in-process cache first
+        ip_info = self.ip_cache.get(ip)
+        if ip_info is not None:
+            return ip_info
+
+        # Then the shared redis cache
         cache_key = f'{settings.IP_LOCATION_REDIS_PREFIX}:{ip}'
-        cached = await redis.get(cache_key) if ip != '0.0.0.0' else None
-        
+        cached = await redis.get(cache_key)
+
         if cached:
             try:
                 country, region, city = cached.split('|')
-                return IpInfo(ip=ip, country=country, region=region, city=city)
+                ip_info = IpInfo(ip=ip, country=country, region=region, city=city)
+                self.ip_cache.set(ip, ip_info)
+                return ip_info
             except Exception:
                 pass  # Fall through to fresh lookup
 
@@ -125,7 +117,7 @@ class RequestParser:
         if settings.IP_LOCATION_PARSE == 'online':
             location_info = await self.get_location_online(ip, request.headers.get('User-Agent'))
         elif settings.IP_LOCATION_PARSE == 'offline':
-            location_info = await self.get_location_offline(ip)
+            location_info = self.get_location_offline(ip)
 
         # Process and cache results
         country = region = city = None
@@ -133,24 +125,31 @@ class RequestParser:
             country = location_info.get('country')
             region = location_info.get('regionName', location_info.get('region'))
             city = location_info.get('city')
-            
-            if ip != '0.0.0.0':
-                await redis.set(
+
+            # Write back to redis off the response path
+            run_in_background(
+                redis.set(
                     cache_key,
                     f'{country or ""}|{region or ""}|{city or ""}',
                     ex=settings.IP_LOCATION_EXPIRE_SECONDS,
                 )
+            )
 
-        return IpInfo(ip=ip, country=country, region=region, city=city)
+        ip_info = IpInfo(ip=ip, country=country, region=region, city=city)
+        self.ip_cache.set(ip, ip_info)
+        return ip_info
 
-    def parse_user_agent_info(self, request: Request) -> UserAgentInfo:
+    def parse_user_agent(self, user_agent: str) -> UserAgentInfo:
         """
-        Parse user agent information with fallback values
+        Parse a raw user agent string with fallback values, memoized by the raw string
         """
-        user_agent = request.headers.get('User-Agent', '')
+        ua_info = self.ua_cache.get(user_agent)
+        if ua_info is not None:
+            return ua_info
+
         try:
             _user_agent = parse(user_agent)
-            return UserAgentInfo(
+            ua_info = UserAgentInfo(
                 user_agent=user_agent,
                 device=_user_agent.get_device() or 'Unknown',
                 os=_user_agent.get_os() or 'Unknown',
@@ -158,11 +157,26 @@ class RequestParser:
             )
         except Exception as e:
             log.warning(f'User agent parsing failed: {str(e)}')
-            return UserAgentInfo(
+            ua_info = UserAgentInfo(
                 user_agent=user_agent,
                 device='Unknown',
                 os='Unknown',
                 browser='Unknown'
             )
+        self.ua_cache.set(user_agent, ua_info)
+        return ua_info
+
+    def parse_user_agent_info(self, request: Request) -> UserAgentInfo:
+        """
+        Parse user agent information of the request
+        """
+        return self.parse_user_agent(request.headers.get('User-Agent', ''))
+
+    def prewarm_user_agents(self, user_agents: list[str]) -> None:
+        """
+        Pre-populate the user agent cache with known app user agents
+        """
+        for user_agent in user_agents:
+            self.parse_user_agent(user_agent)
 
 request_parser: RequestParser = RequestParser()
\ No newline at end of file
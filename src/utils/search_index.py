@@ -0,0 +1,135 @@
+import re
+from collections import defaultdict
+from typing import Any, Hashable, Iterable, Sequence
+
+_NON_WORD = re.compile(r'[^\w]+')
+_LIKE_SPECIAL = re.compile(r'([\\%_])')
+
+
+def normalize(text: str | None) -> str:
+    return _NON_WORD.sub(' ', text.lower()).strip() if text else ''
+
+
+def escape_like(text: str) -> str:
+    """
+    Escape LIKE wildcards so user input matches literally, for use with ``escape='\\'``
+
+    :param text: User input
+    :return:
+    """
+    return _LIKE_SPECIAL.sub(r'\\\1', text)
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def word_trigrams(text: str | None) -> frozenset[str]:
+    """
+    Trigrams the way pg_trgm extracts them: per lowercased word, padded with two spaces in
+    front and one behind
+
+    :param text: Text
+    :return:
+    """
+    return frozenset(gram for word in normalize(text).replace('_', ' ').split() for gram in trigrams(f'  {word} '))
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """
+    pg_trgm ``similarity`` of two trigram sets
+
+    :param a: Trigrams of the first text
+    :param b: Trigrams of the second text
+    :return:
+    """
+    common = len(a & b)
+    union = len(a) + len(b) - common
+    return common / union if union else 0.0
+
+
+class SearchIndex:
+    """
+    In-memory substring index over a few short fields
+
+    Matches and ranks like the SQL catalog search: a document matches when the query occurs
+    case-insensitively in one of its field values, and matches are ordered by their best
+    pg_trgm similarity to the query, then by sort key. Trigram postings of the field values
+    only narrow down the candidates that are checked.
+    """
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        self._trigrams: dict[tuple[str, str], set[Hashable]] = defaultdict(set)
+        self._values: dict[Hashable, dict[str, list[tuple[str, frozenset[str]]]]] = {}
+        self._sort_keys: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._values
+
+    def add(self, doc_id: Hashable, sort_key: Any, **fields: str | Sequence[str] | None) -> None:
+        """
+        Index a document, replacing any previous version of it
+
+        :param doc_id: Document id
+        :param sort_key: Tie-breaker between equally ranked documents
+        :param fields: Text of each field, or its texts when the field has several values
+        :return:
+        """
+        self.remove(doc_id)
+        values: dict[str, list[tuple[str, frozenset[str]]]] = {}
+        for field in self.fields:
+            texts = fields.get(field) or ()
+            if isinstance(texts, str):
+                texts = (texts,)
+            values[field] = [(text.lower(), word_trigrams(text)) for text in texts if text]
+            for text, _ in values[field]:
+                for gram in trigrams(text):
+                    self._trigrams[(field, gram)].add(doc_id)
+        self._values[doc_id] = values
+        self._sort_keys[doc_id] = sort_key
+
+    def remove(self, doc_id: Hashable) -> None:
+        for field, values in self._values.pop(doc_id, {}).items():
+            for text, _ in values:
+                for gram in trigrams(text):
+                    docs = self._trigrams.get((field, gram))
+                    if docs is not None:
+                        docs.discard(doc_id)
+                        if not docs:
+                            del self._trigrams[(field, gram)]
+        self._sort_keys.pop(doc_id, None)
+
+    def _candidates(self, field: str, grams: set[str]) -> Iterable[Hashable]:
+        if not grams:
+            # Queries shorter than a trigram are checked against every document
+            return self._values
+        return set.intersection(*(self._trigrams.get((field, gram), set()) for gram in grams))
+
+    def search(self, query: str) -> list[Hashable]:
+        """
+        Ids of the matching documents, best match first
+
+        :param query: Search text
+        :return:
+        """
+        if not query:
+            return []
+        needle = query.lower()
+        grams = trigrams(needle)
+        query_trigrams = word_trigrams(query)
+        scores: dict[Hashable, float] = {}
+        for field in self.fields:
+            for doc_id in self._candidates(field, grams):
+                if doc_id in scores:
+                    continue
+                if any(needle in text for text, _ in self._values[doc_id][field]):
+                    scores[doc_id] = max(
+                        (similarity(value_trigrams, query_trigrams)
+                         for values in self._values[doc_id].values() for _, value_trigrams in values),
+                        default=0.0,
+                    )
+        return sorted(scores, key=lambda doc_id: (-scores[doc_id], self._sort_keys[doc_id]))
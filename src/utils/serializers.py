@@ -1,7 +1,56 @@
+import hashlib
 from typing import Any
-from starlette.responses import JSONResponse
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 from msgspec import json
 
+
+def make_etag(body: bytes) -> str:
+    """
+    Strong ETag from the hash of a response body
+
+    :param body: Encoded response body
+    :return:
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header already names the given ETag
+
+    :param request: Request object
+    :param etag: Quoted entity tag
+    :return:
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+
 class MsgSpecJSONResponse(JSONResponse):
     def render(self, content: Any) -> bytes:
-        return json.encode(content)
\ No newline at end of file
+        return json.encode(content)
+
+    def with_etag(self, request: Request, etag: str | None = None) -> Response:
+        """
+        Tag the response with a strong ETag, answering 304 when the client already holds it
+
+        :param request: Request object
+        :param etag: Quoted entity tag, the body hash when omitted
+        :return:
+        """
+        etag = etag or make_etag(self.body)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        self.headers['ETag'] = etag
+        self.headers['Cache-Control'] = 'no-cache'
+        return self
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from itertools import combinations
+from typing import Hashable
+
+from src.utils.search_index import normalize
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def deletes(word: str, max_distance: int) -> set[str]:
+    """
+    Every string obtained by deleting up to ``max_distance`` characters from ``word``
+
+    :param word: Word
+    :param max_distance: Maximum number of deleted characters
+    :return:
+    """
+    variants = {word}
+    for distance in range(1, min(max_distance, len(word)) + 1):
+        for positions in combinations(range(len(word)), distance):
+            variants.add(''.join(char for i, char in enumerate(word) if i not in positions))
+    return variants
+
+
+class SuggestIndex:
+    """
+    Typo-tolerant completion over short names with a SymSpell-style deletion index
+
+    Word prefixes up to ``prefix_length`` characters are indexed under all their deletion
+    variants, so a typed word is resolved with a few dictionary lookups instead of an edit
+    distance scan of the vocabulary. A name matches when every typed word, in full, is within
+    the allowed distance of a prefix of one of its words.
+    """
+
+    def __init__(self, max_distance: int = 1, prefix_length: int = 7) -> None:
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._deletes: dict[str, set[str]] = defaultdict(set)
+        self._prefix_words: dict[str, set[str]] = defaultdict(set)
+        self._word_entries: dict[str, set[Hashable]] = defaultdict(set)
+        self._entries: dict[Hashable, tuple[str, list[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: Hashable, name: str) -> None:
+        self.remove(key)
+        words = normalize(name).split()
+        self._entries[key] = (name, words)
+        for word in words:
+            if word not in self._word_entries:
+                for end in range(1, min(len(word), self.prefix_length) + 1):
+                    prefix = word[:end]
+                    self._prefix_words[prefix].add(word)
+                    for variant in deletes(prefix, self.max_distance):
+                        self._deletes[variant].add(prefix)
+            self._word_entries[word].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for word in entry[1]:
+            keys = self._word_entries.get(word)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    # Deletion variants of the word are left behind and only cost a lookup
+                    del self._word_entries[word]
+                    for end in range(1, min(len(word), self.prefix_length) + 1):
+                        self._prefix_words[word[:end]].discard(word)
+
+    @staticmethod
+    def _distance(typed: str, word: str, max_distance: int) -> int:
+        # The whole typed word against the start of the word of about the same length, a typo may
+        # have added or dropped characters
+        shortest = max(0, len(typed) - max_distance)
+        longest = min(len(word), len(typed) + max_distance)
+        return min((edit_distance(typed, word[:end]) for end in range(shortest, longest + 1)), default=max_distance + 1)
+
+    def _match_word(self, typed: str) -> dict[Hashable, int]:
+        # Very short words would match most of the vocabulary with a typo allowed
+        max_distance = self.max_distance if len(typed) > 3 else 0
+        matches: dict[Hashable, int] = {}
+        prefixes = set()
+        for variant in deletes(typed[: self.prefix_length], max_distance):
+            prefixes |= self._deletes.get(variant, set())
+        # Indexed prefixes only find the candidates, they are cut short for long words
+        words = {word for prefix in prefixes for word in self._prefix_words.get(prefix, ())}
+        for word in words:
+            distance = self._distance(typed, word, max_distance)
+            if distance > max_distance:
+                continue
+            for key in self._word_entries.get(word, ()):
+                if distance < matches.get(key, max_distance + 1):
+                    matches[key] = distance
+        return matches
+
+    def suggest(self, query: str, limit: int) -> list[tuple[Hashable, str]]:
+        """
+        Best completions of a partially typed query
+
+        :param query: Typed text
+        :param limit: Maximum number of suggestions
+        :return: Keys and names, closest and shortest first
+        """
+        typed_words = normalize(query).split()
+        if not typed_words:
+            return []
+        scores: dict[Hashable, int] | None = None
+        for typed in typed_words:
+            matches = self._match_word(typed)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {key: score + matches[key] for key, score in scores.items() if key in matches}
+            if not scores:
+                return []
+        ranked = sorted(scores, key=lambda key: (scores[key], len(self._entries[key][0]), self._entries[key][0]))
+        return [(key, self._entries[key][0]) for key in ranked[:limit]]
@@ -0,0 +1,35 @@
+import asyncio
+from typing import Any, Coroutine
+
+from src.common.log import log
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        log.warning(f'Background task failed: {task.exception()}')
+
+
+def run_in_background(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    Schedule a coroutine off the response path and keep a reference until it finishes
+
+    :param coro: Coroutine to run
+    :return:
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_task_done)
+    return task
+
+
+async def wait_for_background_tasks() -> None:
+    """
+    Wait until every background task has finished, including tasks they schedule in turn
+
+    :return:
+    """
+    while _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
@@ -24,6 +24,9 @@ class TimeZone:
     def t_str(dt: datetime, format_str: str = settings.DATETIME_FORMAT) -> str:
         return dt.strftime(format_str)
 
+    def from_timestamp(self, timestamp: float) -> datetime:
+        return datetime.fromtimestamp(timestamp, self.tz_info)
+
     @staticmethod
     def f_utc(dt: datetime) -> datetime:
         return dt.astimezone(datetime_timezone.utc)
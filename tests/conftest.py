@@ -0,0 +1,59 @@
+import os
+
+# Settings are read at import time, so the environment has to be in place first
+for key, value in {
+    'ENVIRONMENT': 'dev',
+    'DATABASE_HOST': 'localhost',
+    'DATABASE_PORT': '5432',
+    'DATABASE_USER': 'postgres',
+    'DATABASE_PASSWORD': 'postgres',
+    'DATABASE_NAME': 'swipewise_test',
+    'REDIS_URL': 'redis://localhost:6379/0',
+    'TOKEN_SECRET_KEY': 'test-secret-key',
+}.items():
+    os.environ.setdefault(key, value)
+
+import fakeredis
+import pytest
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import src.backend  # noqa: F401  registers every model
+from src.common.model import MappedBase
+from src.database.db import db
+from src.database.redis import redis
+from src.utils.search_index import similarity, word_trigrams
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.fixture(autouse=True)
+def fake_redis() -> None:
+    # Registered Lua scripts hold on to the client, so only its connection pool is swapped
+    redis.connection_pool = fakeredis.FakeAsyncRedis(decode_responses=True).connection_pool
+
+
+def _register_sqlite_functions(dbapi_connection, connection_record) -> None:
+    # Stand-ins for the Postgres functions the catalog search ranks with
+    dbapi_connection.create_function(
+        'similarity', 2, lambda a, b: similarity(word_trigrams(a), word_trigrams(b)), deterministic=True
+    )
+    dbapi_connection.create_function(
+        'greatest', -1, lambda *args: max((arg for arg in args if arg is not None), default=None), deterministic=True
+    )
+
+
+@pytest.fixture
+async def session_maker(monkeypatch: pytest.MonkeyPatch) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine('sqlite+aiosqlite://')
+    event.listen(engine.sync_engine, 'connect', _register_sqlite_functions)
+    async with engine.begin() as conn:
+        await conn.run_sync(MappedBase.metadata.create_all)
+    maker = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(db, 'db_session', maker)
+    yield maker
+    await engine.dispose()
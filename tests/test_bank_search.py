@@ -0,0 +1,32 @@
+import pytest
+
+from fastapi_pagination import set_params
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.backend.bank.crud import bank_dao
+from src.backend.bank.model import Bank
+from src.backend.card.model import Card
+from src.common.pagination import _CustomPageParams, paging_data
+
+pytestmark = pytest.mark.anyio
+
+BANKS = 4
+CARDS_PER_BANK = 50
+
+
+async def test_bank_with_several_matching_cards_is_listed_once(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        for i in range(BANKS):
+            bank = Bank(name=f'Bank {i}', logo_url='', website='')
+            bank.cards = [Card(name=f'Rewards card {j}', bank_id=0) for j in range(CARDS_PER_BANK)]
+            session.add(bank)
+        session.add(Bank(name='Rewards Bank', logo_url='', website=''))
+        await session.commit()
+
+        banks = (await session.scalars(await bank_dao.bank_list_stmt('rewards'))).all()
+        assert len(banks) == len({bank.id for bank in banks}) == BANKS + 1
+
+        with set_params(_CustomPageParams(page=1, size=2)):
+            page = await paging_data(session, await bank_dao.bank_list_stmt('rewards'), count='cached')
+        assert page.total == BANKS + 1
+        assert len(page.items) == 2
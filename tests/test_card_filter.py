@@ -0,0 +1,47 @@
+import pytest
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.backend.card.crud import card_dao
+from src.backend.card.model import Card
+from src.backend.card.schemas import CardFilterParams
+from src.backend.seeder.seeder import seeder
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_seeded_fees_are_bucketed_in_cents(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        await seeder.seed_initial_data(session)
+        session.add(Card(name='Unpriced', bank_id=1))
+        await session.commit()
+
+        fees = (await session.scalars(select(Card.annual_fee))).all()
+        counts = dict((await card_dao.card_facets(session, CardFilterParams()))['annual_fee'])
+        assert counts == {
+            'none': fees.count(0),
+            'up_to_100': sum(1 for fee in fees if fee is not None and 0 < fee <= 10000),
+            '100_to_300': sum(1 for fee in fees if fee is not None and 10000 < fee <= 30000),
+            'over_300': sum(1 for fee in fees if fee is not None and fee > 30000),
+            'unknown': 1,
+        }
+        assert counts['100_to_300'] and counts['over_300']
+        assert sum(counts.values()) == len(fees)
+
+        stmt = await card_dao.card_filter_stmt(CardFilterParams(min_annual_fee=20000, max_annual_fee=40000))
+        cards = (await session.scalars(stmt)).unique().all()
+        assert cards and all(20000 <= card.annual_fee <= 40000 for card in cards)
+
+
+@pytest.mark.parametrize(
+    ('sort', 'order_by'),
+    [
+        ('annual_fee', 'card.annual_fee ASC, card.id ASC'),
+        ('-annual_fee', 'card.annual_fee DESC, card.id DESC'),
+        ('-interest_rate,name', 'card.interest_rate DESC, card.name ASC, card.id DESC'),
+    ],
+)
+async def test_sort_tiebreaker_follows_the_first_key(sort: str, order_by: str) -> None:
+    stmt = await card_dao.card_filter_stmt(CardFilterParams(sort=sort))
+    assert str(stmt).endswith(f'ORDER BY {order_by}')
@@ -0,0 +1,166 @@
+from datetime import timedelta
+
+import msgspec
+import pytest
+
+from fastapi import FastAPI
+from fastapi_pagination import add_pagination
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.backend.bank.model import Bank
+from src.backend.card.crud import card_dao
+from src.backend.card.model import Card
+from src.backend.card.routes import router as card_router
+from src.backend.catalog.model import CatalogTombstone
+from src.backend.catalog.routes import router as catalog_router
+from src.backend.catalog.service import catalog_service
+from src.common.response.response_cache import response_cache
+from src.core.settings import settings
+from src.utils.tasks import wait_for_background_tasks
+from src.utils.timezone import timezone
+
+pytestmark = pytest.mark.anyio
+
+
+async def fetch_changes(since: int) -> list[dict]:
+    app = FastAPI()
+    app.include_router(catalog_router)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.get('/catalog/changes', params={'since': since})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    return [msgspec.json.decode(line) for line in response.text.splitlines()]
+
+
+def card(name: str) -> Card:
+    return Card(
+        name=name, bank_id=0, description='', annual_fee=0, reward_desc='', interest_rate=0, min_credit_score=0
+    )
+
+
+async def test_changes_stream_upserts_deletes_and_snapshots(
+    session_maker: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, 'CATALOG_CHANGES_OVERLAP_SECONDS', 0)
+    async with session_maker() as session:
+        bank = Bank(name='Chase', logo_url='', website='')
+        bank.cards = [card('Sapphire'), card('Freedom'), card('Slate')]
+        session.add(bank)
+        await session.commit()
+    await wait_for_background_tasks()
+
+    snapshot = await fetch_changes(0)
+    synced = await response_cache.version()
+    assert snapshot[0] == {'op': 'meta', 'version': synced, 'full': True}
+    assert {(line['entity'], line['data']['name']) for line in snapshot[1:]} == {
+        ('bank', 'Chase'), ('card', 'Sapphire'), ('card', 'Freedom'), ('card', 'Slate'),
+    }
+
+    async with session_maker() as session:
+        cards = {card.name: card for card in await session.scalars(select(Card))}
+        cards['Freedom'].name = 'Freedom Flex'
+        await session.delete(cards['Slate'])
+        await session.commit()
+    await wait_for_background_tasks()
+
+    delta = await fetch_changes(synced)
+    assert delta[0] == {'op': 'meta', 'version': await response_cache.version(), 'full': False}
+    assert delta[1:] == [
+        {'op': 'upsert', 'entity': 'card', 'data': {**delta[1]['data'], 'name': 'Freedom Flex'}},
+        {'op': 'delete', 'entity': 'card', 'id': cards['Slate'].id},
+    ]
+
+    # Versions past the retention window are forgotten and get a full snapshot again
+    monkeypatch.setattr(settings, 'CATALOG_CHANGES_RETENTION_SECONDS', 0)
+    async with session_maker() as session:
+        await card_dao.update_model(session, cards['Sapphire'].id, {'annual_fee': 9500}, commit=True)
+    await wait_for_background_tasks()
+    expired = await fetch_changes(synced)
+    assert expired[0] == {'op': 'meta', 'version': await response_cache.version(), 'full': True}
+    assert {line['data']['name'] for line in expired[1:]} == {'Chase', 'Sapphire', 'Freedom Flex'}
+
+
+async def test_tombstones_older_than_retention_are_pruned(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    retention = settings.CATALOG_CHANGES_RETENTION_SECONDS + settings.CATALOG_CHANGES_OVERLAP_SECONDS
+    async with session_maker() as session:
+        session.add(CatalogTombstone(entity='card', entity_id=1))
+        session.add(CatalogTombstone(entity='card', entity_id=2))
+        await session.flush()
+        old = await session.get(CatalogTombstone, 1)
+        old.created_time = timezone.now() - timedelta(seconds=retention + 60)
+        await session.commit()
+
+    assert await catalog_service.prune_tombstones() == 1
+    async with session_maker() as session:
+        assert (await session.scalars(select(CatalogTombstone.entity_id))).all() == [2]
+
+
+async def test_dao_writes_invalidate_cached_pages(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        bank = Bank(name='Chase', logo_url='', website='')
+        bank.cards = [card('Sapphire'), card('Freedom')]
+        session.add(bank)
+        await session.commit()
+    await wait_for_background_tasks()
+
+    app = FastAPI()
+    app.include_router(card_router)
+    add_pagination(app)
+
+    async def card_names() -> list[str]:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.get('/card/filter')
+        assert response.status_code == 200
+        return [item['name'] for item in response.json()['data']['cards']['items']]
+
+    assert await card_names() == ['Freedom', 'Sapphire']
+    await wait_for_background_tasks()
+    hits = response_cache.hits
+    assert await card_names() == ['Freedom', 'Sapphire']
+    assert response_cache.hits == hits + 1
+
+    async with session_maker() as session:
+        await card_dao.update_model(session, bank.cards[0].id, {'name': 'Sapphire Reserve'}, commit=True)
+    await wait_for_background_tasks()
+    assert await card_names() == ['Freedom', 'Sapphire Reserve']
+
+    async with session_maker() as session:
+        await card_dao.delete_model(session, bank.cards[1].id, commit=True)
+    await wait_for_background_tasks()
+    assert await card_names() == ['Sapphire Reserve']
+
+
+async def test_dao_deletes_record_tombstones(
+    session_maker: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, 'CATALOG_CHANGES_OVERLAP_SECONDS', 0)
+    async with session_maker() as session:
+        bank = Bank(name='Chase', logo_url='', website='')
+        bank.cards = [card('Sapphire'), card('Freedom'), card('Slate')]
+        session.add(bank)
+        await session.commit()
+    await wait_for_background_tasks()
+    synced = await response_cache.version()
+    sapphire, freedom, slate = (card.id for card in bank.cards)
+
+    async with session_maker() as session:
+        assert await card_dao.delete_model(session, sapphire) == 1
+        assert await card_dao.delete_model_by_column(session, allow_multiple=True, name__in=['Freedom', 'Gone']) == 1
+        await session.commit()
+    await wait_for_background_tasks()
+
+    delta = await fetch_changes(synced)
+    assert delta[0] == {'op': 'meta', 'version': await response_cache.version(), 'full': False}
+    assert delta[1:] == [
+        {'op': 'delete', 'entity': 'card', 'id': sapphire},
+        {'op': 'delete', 'entity': 'card', 'id': freedom},
+    ]
+
+    # A rolled back delete leaves neither the row nor its tombstone behind
+    async with session_maker() as session:
+        await card_dao.delete_model(session, slate)
+        await session.rollback()
+        assert (await session.scalars(select(Card.id))).all() == [slate]
+        assert (await session.scalars(select(CatalogTombstone.entity_id))).all() == [sapphire, freedom]
@@ -0,0 +1,108 @@
+import msgspec
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from src.backend.bank.crud import bank_dao
+from src.backend.bank.model import Bank
+from src.backend.card.crud import card_dao
+from src.backend.card.model import Card
+from src.backend.card import service as card_service_module
+from src.backend.card.service import card_service
+from src.backend.catalog.search_index import CatalogSearchIndex
+from src.common.response.response_cache import response_cache
+from src.core.settings import settings
+from src.utils.tasks import wait_for_background_tasks
+
+pytestmark = pytest.mark.anyio
+
+CATALOG = {
+    'Chase': ['Sapphire Preferred', 'Sapphire Reserve', 'Freedom Unlimited'],
+    'American Express': ['Gold Card', 'Platinum Card', 'Blue Cash 100%'],
+    'Capital One': ['Venture X', 'Quicksilver', 'Savor_One'],
+    'Gold Bank': [],
+}
+
+QUERIES = ['sapphire', 'SAPP', 'ld', 'x', 'gold', 'card', 'platnum', 'express', '100%', '%', '_', 'r_o', 'one ']
+
+
+async def seed(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        for bank_name, card_names in CATALOG.items():
+            bank = Bank(name=bank_name, logo_url='', website='')
+            bank.cards = [
+                Card(
+                    name=name, bank_id=0, description='', annual_fee=0, reward_desc='',
+                    interest_rate=0, min_credit_score=0,
+                )
+                for name in card_names
+            ]
+            session.add(bank)
+        await session.commit()
+
+
+async def test_index_matches_sql_search(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    await seed(session_maker)
+    index = CatalogSearchIndex()
+    assert await index.sync()
+
+    async with session_maker() as session:
+        for q in QUERIES:
+            cards = await session.scalars(await card_dao.card_list_stmt(q))
+            assert index.cards.search(q) == [card.id for card in cards], q
+            banks = await session.scalars(await bank_dao.bank_list_stmt(q))
+            assert index.banks.search(q) == [bank.id for bank in banks], q
+
+
+@pytest.mark.parametrize('search_index', [True, False])
+async def test_suggest_matches_literally_and_ignores_blank_queries(
+    session_maker: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch, search_index: bool
+) -> None:
+    await seed(session_maker)
+    monkeypatch.setattr(settings, 'CATALOG_SEARCH_INDEX', search_index)
+    monkeypatch.setattr(card_service_module, 'catalog_search_index', CatalogSearchIndex())
+    async with session_maker() as session:
+        assert await card_service.suggest(session, '  ', 8) == []
+        assert await card_service.suggest(session, '%', 8) == []
+        assert [s.name for s in await card_service.suggest(session, 'savor_', 8)] == ['Savor_One']
+
+
+async def test_index_reads_the_catalog_version_at_most_once_per_interval(
+    session_maker: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await seed(session_maker)
+    await wait_for_background_tasks()
+    index = CatalogSearchIndex()
+    reads = []
+    version = response_cache.version
+
+    async def counting_version() -> int:
+        reads.append(True)
+        return await version()
+
+    monkeypatch.setattr(response_cache, 'version', counting_version)
+    for _ in range(5):
+        assert await index.sync()
+    assert len(reads) == 1
+
+    async with session_maker() as session:
+        card = Card(
+            name='Sapphire Lounge', bank_id=1, description='', annual_fee=0, reward_desc='',
+            interest_rate=0, min_credit_score=0,
+        )
+        session.add(card)
+        await session.commit()
+    await wait_for_background_tasks()
+
+    # A response cached under the new version is built from an index at least that fresh
+    async def build() -> list[int]:
+        assert await index.sync()
+        return index.cards.search('lounge')
+
+    request = Request(
+        {'type': 'http', 'method': 'GET', 'path': '/card/search', 'query_string': b'q=lounge', 'headers': []}
+    )
+    response = await response_cache.cached(request, list[int], build)
+    assert msgspec.json.decode(response.body)['data'] == [card.id]
+    assert len(reads) == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from src.utils import circuit_breaker as circuit_breaker_module
+from src.utils.circuit_breaker import CircuitBreaker
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker_module.time, 'monotonic', clock.monotonic)
+    return clock
+
+
+def test_breaker_opens_then_half_opens_then_closes(clock: Clock) -> None:
+    breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=30)
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.state == 'half_open'
+    # A single trial call is let through
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_failed_trial_reopens_the_breaker(clock: Clock) -> None:
+    breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    clock.now += 29
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+
+
+def test_released_trial_lets_another_through(clock: Clock) -> None:
+    breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_success_resets_the_failure_count(clock: Clock) -> None:
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
@@ -0,0 +1,94 @@
+import pytest
+
+from fastapi import FastAPI
+from fastapi_pagination import add_pagination
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from src.backend.bank.model import Bank
+from src.backend.card.crud import card_dao
+from src.backend.card.model import Card
+from src.backend.card.routes import router as card_router
+from src.utils.serializers import MsgSpecJSONResponse, etag_matches, make_etag
+from src.utils.tasks import wait_for_background_tasks
+
+ETAG = '"abc"'
+
+
+def request(if_none_match: str | None = None) -> Request:
+    headers = [(b'if-none-match', if_none_match.encode())] if if_none_match is not None else []
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'query_string': b'', 'headers': headers})
+
+
+@pytest.mark.parametrize(
+    'if_none_match',
+    [ETAG, f'W/{ETAG}', f'"other", {ETAG}', f'"other",W/{ETAG} , "third"', '*', ' * '],
+)
+def test_etag_matches(if_none_match: str) -> None:
+    assert etag_matches(request(if_none_match), ETAG)
+
+
+@pytest.mark.parametrize('if_none_match', [None, '', '"abcd"', 'abc', '"other", "third"', 'W/"ab"'])
+def test_etag_does_not_match(if_none_match: str | None) -> None:
+    assert not etag_matches(request(if_none_match), ETAG)
+
+
+def test_with_etag_answers_304_when_the_body_is_unchanged() -> None:
+    response = MsgSpecJSONResponse({'data': 1}).with_etag(request())
+    assert response.status_code == 200
+    assert response.headers['ETag'] == make_etag(response.body)
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    revalidated = MsgSpecJSONResponse({'data': 1}).with_etag(request(response.headers['ETag']))
+    assert revalidated.status_code == 304
+    assert revalidated.body == b''
+    assert revalidated.headers['ETag'] == response.headers['ETag']
+
+    changed = MsgSpecJSONResponse({'data': 2}).with_etag(request(response.headers['ETag']))
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != response.headers['ETag']
+
+
+@pytest.mark.anyio
+async def test_catalog_etag_changes_after_a_write(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    async with session_maker() as session:
+        bank = Bank(name='Chase', logo_url='', website='')
+        bank.cards = [
+            Card(
+                name='Sapphire', bank_id=0, description='', annual_fee=0, reward_desc='', interest_rate=0,
+                min_credit_score=0,
+            )
+        ]
+        session.add(bank)
+        await session.commit()
+    await wait_for_background_tasks()
+
+    app = FastAPI()
+    app.include_router(card_router)
+    add_pagination(app)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        first = await client.get('/card/filter')
+        etag = first.headers['ETag']
+        assert first.status_code == 200
+        await wait_for_background_tasks()
+
+        cached = await client.get('/card/filter')
+        assert cached.status_code == 200
+        assert cached.headers['ETag'] == etag
+        assert (await client.get('/card/filter', headers={'If-None-Match': etag})).status_code == 304
+        assert (await client.get('/card/filter', headers={'If-None-Match': f'W/{etag}'})).status_code == 304
+        # Other queries carry their own tag
+        other = await client.get('/card/filter', params={'page': 2}, headers={'If-None-Match': etag})
+        assert other.status_code == 200
+
+        async with session_maker() as session:
+            await card_dao.update_model(session, bank.cards[0].id, {'name': 'Sapphire Reserve'}, commit=True)
+        await wait_for_background_tasks()
+
+        updated = await client.get('/card/filter', headers={'If-None-Match': etag})
+        assert updated.status_code == 200
+        assert updated.headers['ETag'] != etag
+        assert updated.json()['data']['cards']['items'][0]['name'] == 'Sapphire Reserve'
+        assert (await client.get('/card/filter', headers={'If-None-Match': updated.headers['ETag']})).status_code == 304
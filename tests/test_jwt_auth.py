@@ -0,0 +1,140 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.backend.auth.routes import router as auth_router
+from src.common.data_classes import RefreshToken, Token
+from src.common.exception.errors import TokenError
+from src.common.security.jwt import jwt_token
+from src.core.settings import settings
+from src.database.redis import redis
+from src.middleware.middleware import middleware
+from src.utils.timezone import timezone
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_token_is_decoded_once_per_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    app = FastAPI()
+    middleware.register(app)
+    app.include_router(auth_router)
+    token = await jwt_token.create_token('1')
+
+    decodes = []
+    jwt_decode = jwt_token.jwt_decode
+
+    def counting_decode(token: str):
+        decodes.append(token)
+        return jwt_decode(token)
+
+    monkeypatch.setattr(jwt_token, 'jwt_decode', counting_decode)
+    headers = {'Authorization': f'Bearer {token.access_token.access_token}'}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        for _ in range(2):
+            decodes.clear()
+            response = await client.get('/auth/sessions', headers=headers)
+            assert response.status_code == 200
+            assert len(decodes) == 1
+
+
+async def rotate(refresh_token: RefreshToken) -> Token:
+    family_id = jwt_token.jwt_decode(refresh_token.refresh_token).family_id
+    return await jwt_token.create_new_token('1', refresh_token, family_id)
+
+
+async def test_refresh_rotation_keeps_one_record_per_family() -> None:
+    token = await jwt_token.create_token('1')
+    refresh_token = token.refresh_token
+    for _ in range(3):
+        token = await rotate(refresh_token)
+        assert jwt_token.jwt_decode(token.refresh_token.refresh_token).family_id == (
+            jwt_token.jwt_decode(refresh_token.refresh_token).family_id
+        )
+        refresh_token = token.refresh_token
+
+    assert len(await redis.keys(f'{settings.TOKEN_REFRESH_FAMILY_REDIS_PREFIX}:1:*')) == 1
+    assert await redis.keys(f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:*') == []
+    await jwt_token.jwt_authentication(token.access_token.access_token)
+
+
+async def test_refresh_token_reuse_revokes_every_session() -> None:
+    first = await jwt_token.create_token('1')
+    other_device = await jwt_token.create_token('1')
+    rotated = await rotate(first.refresh_token)
+
+    with pytest.raises(TokenError, match='already been used'):
+        await rotate(first.refresh_token)
+    for token in (rotated, other_device):
+        with pytest.raises(TokenError, match='expired'):
+            await rotate(token.refresh_token)
+        with pytest.raises(TokenError):
+            await jwt_token.jwt_authentication(token.access_token.access_token)
+
+
+async def test_refresh_token_issued_before_families_starts_a_family() -> None:
+    expire = timezone.now() + timedelta(seconds=settings.TOKEN_REFRESH_EXPIRE_SECONDS)
+    legacy = jwt_token._jwt_encode({'exp': expire, 'sub': '1', 'jti': uuid4().hex})
+    digest = jwt_token._refresh_token_digest(legacy)
+    await redis.setex(
+        f'{settings.TOKEN_REFRESH_REDIS_PREFIX}:1:{digest}', settings.TOKEN_REFRESH_EXPIRE_SECONDS, 'live'
+    )
+    refresh_token = RefreshToken(refresh_token=legacy, refresh_token_expire_time=expire)
+
+    token = await rotate(refresh_token)
+    assert jwt_token.jwt_decode(token.refresh_token.refresh_token).family_id
+    assert len(await redis.keys(f'{settings.TOKEN_REFRESH_FAMILY_REDIS_PREFIX}:1:*')) == 1
+    token = await rotate(token.refresh_token)
+
+    with pytest.raises(TokenError, match='already been used'):
+        await rotate(refresh_token)
+    with pytest.raises(TokenError, match='expired'):
+        await rotate(token.refresh_token)
+
+
+async def test_sessions_survive_refresh_and_are_revoked_together() -> None:
+    first = await jwt_token.create_token('1')
+    second = await jwt_token.create_token('1')
+    family_ids = {jwt_token.jwt_decode(token.refresh_token.refresh_token).family_id for token in (first, second)}
+    refreshed = await rotate(first.refresh_token)
+
+    sessions = await jwt_token.get_sessions('1')
+    assert {session.session_uuid for session in sessions} == family_ids
+    # Sessions live as long as their refresh token, not their access token
+    assert min(session.expire_time for session in sessions) > first.access_token.access_token_expire_time
+    # The refresh replaced the session's access token
+    with pytest.raises(TokenError):
+        await jwt_token.jwt_authentication(first.access_token.access_token)
+    await jwt_token.jwt_authentication(refreshed.access_token.access_token)
+
+    await jwt_token.revoke_all_tokens('1')
+    assert await jwt_token.get_sessions('1') == []
+    for token in (refreshed, second):
+        with pytest.raises(TokenError):
+            await jwt_token.jwt_authentication(token.access_token.access_token)
+        with pytest.raises(TokenError, match='expired'):
+            await rotate(token.refresh_token)
+    assert await redis.keys('*token*') == []
+
+
+async def test_revocation_during_lookup_is_not_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    token = await jwt_token.create_token('1')
+    session_key = f'1:{token.access_token.session_uuid}'
+    get = redis.get
+
+    async def get_then_revoke(key: str):
+        value = await get(key)
+        # The revocation message arrives while the lookup is in flight
+        jwt_token._remove_revoked(session_key)
+        return value
+
+    monkeypatch.setattr(redis, 'get', get_then_revoke)
+    await jwt_token.jwt_authentication(token.access_token.access_token)
+    assert jwt_token.verified_cache.get(session_key) is None
+
+    monkeypatch.setattr(redis, 'get', get)
+    await jwt_token.jwt_authentication(token.access_token.access_token)
+    assert jwt_token.verified_cache.get(session_key) == token.access_token.access_token
@@ -0,0 +1,25 @@
+import pytest
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.backend.monitor.routes import router as monitor_router
+from src.common.security.jwt import jwt_token
+from src.middleware.middleware import middleware
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_monitor_routes_require_authentication() -> None:
+    app = FastAPI()
+    middleware.register(app)
+    app.include_router(monitor_router)
+    token = await jwt_token.create_token('1')
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        for path in ('/monitor/cache', '/monitor/response_cache', '/monitor/password_hash', '/monitor/request_context'):
+            assert (await client.get(path)).status_code == 403
+            response = await client.get(path, headers={'Authorization': f'Bearer {token.access_token.access_token}'})
+            assert response.status_code == 200
+        response = await client.get('/monitor/cache', headers={'Authorization': 'Bearer invalid'})
+        assert response.status_code == 401
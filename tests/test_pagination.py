@@ -0,0 +1,116 @@
+import pytest
+
+from fastapi_pagination import set_params
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.backend.bank.model import Bank
+from src.backend.card.crud import card_dao
+from src.backend.card.model import Card
+from src.common import pagination
+from src.common.exception.errors import RequestError
+from src.common.pagination import (
+    _count_digest,
+    _CursorPageParams,
+    _CustomPageParams,
+    cursor_paging_data,
+    encode_cursor,
+    paging_data,
+)
+from src.core.settings import settings
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def statements(session_maker: async_sessionmaker[AsyncSession]) -> list[str]:
+    executed = []
+    engine = session_maker.kw['bind'].sync_engine
+
+    def listener(conn, cursor, statement: str, *args) -> None:
+        executed.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', listener)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', listener)
+
+
+async def test_estimated_count_reuses_the_planner_estimate(
+    session_maker: async_sessionmaker[AsyncSession], statements: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(pagination, '_estimates', pagination.LocalCache(maxsize=10, ttl=60))
+    async with session_maker() as session:
+        session.add_all(Bank(name=f'Bank {i}', logo_url='', website='') for i in range(3))
+        await session.commit()
+
+        stmt = select(Bank).order_by(Bank.id)
+        # As if the planner had been asked before: a small table is counted exactly, then from redis
+        pagination._estimates.set(_count_digest(stmt), 2)
+        with set_params(_CustomPageParams(page=1, size=2)):
+            statements.clear()
+            first = await paging_data(session, stmt, count='estimate')
+            second = await paging_data(session, stmt, count='estimate')
+        assert (first.total, first.total_strategy) == (3, 'exact')
+        assert (second.total, second.total_strategy) == (3, 'cached')
+        assert not any(statement.startswith('EXPLAIN') for statement in statements)
+        assert sum('count(' in statement.lower() for statement in statements) == 1
+
+        # Large tables keep the estimate and are not counted at all
+        pagination._estimates.set(_count_digest(stmt), settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD)
+        with set_params(_CustomPageParams(page=1, size=2)):
+            statements.clear()
+            page = await paging_data(session, stmt, count='estimate')
+        assert (page.total, page.total_strategy) == (settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD, 'estimate')
+        assert not any('count(' in statement.lower() for statement in statements)
+
+
+async def seed_cards(session: AsyncSession, names: list[str]) -> list[int]:
+    bank = Bank(name='Chase', logo_url='', website='')
+    bank.cards = [Card(name=name, bank_id=0) for name in names]
+    session.add(bank)
+    await session.commit()
+    return [card.id for card in sorted(bank.cards, key=lambda card: (card.name, card.id))]
+
+
+async def cursor_page(session: AsyncSession, cursor: str | None, size: int):
+    with set_params(_CursorPageParams(cursor=cursor, size=size)):
+        return await cursor_paging_data(session, await card_dao.card_list_stmt('', ranked=False), Card.name, Card.id)
+
+
+@pytest.mark.parametrize('size', [1, 3, 4, 12, 20])
+async def test_cursor_pages_walk_every_row_once_in_order(
+    session_maker: async_sessionmaker[AsyncSession], size: int
+) -> None:
+    # Ties on the name are broken by id, so cards sharing a name are neither skipped nor repeated
+    names = ['Gold', 'Blue', 'Gold', 'Gold', 'Amber', 'Gold', 'Blue', 'Zinc', 'Gold', 'Amber', 'Blue', 'Gold']
+    async with session_maker() as session:
+        expected = await seed_cards(session, names)
+        seen, cursor = [], None
+        while True:
+            page = await cursor_page(session, cursor, size)
+            seen += [card.id for card in page.items]
+            assert page.has_more == (page.next_cursor is not None)
+            if not page.has_more:
+                break
+            assert len(page.items) == size
+            cursor = page.next_cursor
+        assert seen == expected
+        # The last page holds the remainder, or a full page when the rows divide evenly
+        assert len(page.items) == (len(names) % size or size)
+
+
+async def test_invalid_cursors_are_rejected(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    cursors = [
+        'not base64!',
+        'bm90IGpzb24',  # base64 of something that is not JSON
+        encode_cursor({'name': 'Gold'}),
+        # One value too few or too many for the (name, id) ordering
+        encode_cursor(['Gold']),
+        encode_cursor(['Gold', 1, 2]),
+    ]
+    async with session_maker() as session:
+        await seed_cards(session, ['Gold', 'Blue'])
+        for cursor in cursors:
+            with pytest.raises(RequestError) as exc_info:
+                await cursor_page(session, cursor, 1)
+            assert exc_info.value.msg == 'Invalid cursor'
@@ -0,0 +1,40 @@
+import pytest
+
+from src.common.security import password_secret as password_secret_module
+from src.common.security.password_secret import PasswordSecret
+from src.core.settings import settings
+from src.database.redis import redis
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_calibration_is_shared_per_hardware_and_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(PasswordSecret, '_measure_rounds', lambda self: 11)
+    first, second, other = PasswordSecret(), PasswordSecret(), PasswordSecret()
+    assert await first.calibrate() == 11
+
+    # Another worker on the same hardware reuses the stored cost instead of measuring again
+    monkeypatch.setattr(PasswordSecret, '_measure_rounds', lambda self: 13)
+    assert await second.calibrate() == 11
+    key = f'{settings.PASSWORD_HASH_ROUNDS_REDIS_KEY}:{password_secret_module._hardware_id()}'
+    assert 0 < await redis.ttl(key) <= settings.PASSWORD_HASH_CALIBRATION_EXPIRE_SECONDS
+
+    # Other hardware measures for itself
+    monkeypatch.setattr(password_secret_module, '_hardware_id', lambda: 'other')
+    assert await other.calibrate() == 13
+    for secret in (first, second, other):
+        secret.close()
+
+
+def test_verify_and_update_only_strengthens_hashes() -> None:
+    secret = PasswordSecret()
+    secret._set_rounds(10)
+    weak = secret.get_hash_password('secret', None)
+    secret._set_rounds(11)
+    strong = secret.get_hash_password('secret', None)
+
+    valid, updated = secret.password_verify_and_update('secret', weak)
+    assert valid and updated.startswith('$2b$11$')
+    secret._set_rounds(10)
+    assert secret.password_verify_and_update('secret', strong) == (True, None)
+    secret.close()
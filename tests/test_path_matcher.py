@@ -0,0 +1,64 @@
+import pytest
+
+from src.utils.path_matcher import PathMatcher
+
+
+@pytest.fixture
+def matcher() -> PathMatcher:
+    return PathMatcher([
+        '/api/v1/auth/login',
+        '/api/v1/catalog/*',
+        '/api/v1/card/{card_id}/detail',
+        'GET /api/v1/bank/{bank_id}',
+    ])
+
+
+@pytest.mark.parametrize('path', ['/api/v1/auth/login', '/api/v1/auth/login/', 'api/v1/auth/login'])
+def test_exact_pattern(matcher: PathMatcher, path: str) -> None:
+    assert path in matcher
+
+
+@pytest.mark.parametrize('path', ['/api/v1/catalog', '/api/v1/catalog/changes', '/api/v1/catalog/a/b/c'])
+def test_prefix_pattern(matcher: PathMatcher, path: str) -> None:
+    assert path in matcher
+
+
+def test_param_pattern(matcher: PathMatcher) -> None:
+    assert '/api/v1/card/42/detail' in matcher
+    assert '/api/v1/card/42' not in matcher
+    assert '/api/v1/card/42/detail/extra' not in matcher
+
+
+@pytest.mark.parametrize(
+    'path',
+    [
+        '/',
+        '/api/v1/auth',
+        '/api/v1/auth/login2',
+        '/api/v1/auth/loginx/extra',
+        '/api/v1/auth/logout',
+        '/api/v1/Auth/login',
+        '/api/v1/catalogs',
+        '/api/v2/catalog/changes',
+        '/api/v1/card//detail',
+    ],
+)
+def test_near_misses(matcher: PathMatcher, path: str) -> None:
+    assert path not in matcher
+
+
+def test_method_specific_pattern(matcher: PathMatcher) -> None:
+    assert matcher.match('/api/v1/bank/7', 'GET')
+    assert matcher.match('/api/v1/bank/7', 'get')
+    assert not matcher.match('/api/v1/bank/7', 'DELETE')
+    assert not matcher.match('/api/v1/bank/7')
+    # Method-less patterns match every method
+    assert matcher.match('/api/v1/auth/login', 'POST')
+
+
+def test_literal_and_param_segments_backtrack() -> None:
+    matcher = PathMatcher(['/card/list', '/card/{card_id}/detail'])
+    assert '/card/list' in matcher
+    assert '/card/list/detail' in matcher
+    assert '/card/7/detail' in matcher
+    assert '/card/7' not in matcher
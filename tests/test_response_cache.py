@@ -0,0 +1,15 @@
+from starlette.requests import Request
+
+from src.common.response.response_cache import response_cache
+
+
+def request(query_string: str) -> Request:
+    return Request(
+        {'type': 'http', 'method': 'GET', 'path': '/card/search', 'query_string': query_string.encode(), 'headers': []}
+    )
+
+
+def test_request_key_keeps_query_values_as_sent() -> None:
+    assert response_cache.request_key(request('q=one&b=2')) == response_cache.request_key(request('b=2&q=one'))
+    # The handler searches for the raw value, so 'one ' must not share the page cached for 'one'
+    assert response_cache.request_key(request('q=one+')) != response_cache.request_key(request('q=one'))
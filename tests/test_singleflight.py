@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_callers_share_one_call() -> None:
+    flight = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def lookup() -> str:
+        calls.append(True)
+        await release.wait()
+        return 'result'
+
+    waiters = [asyncio.create_task(flight.do('key', lookup)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(flight) == 1
+    release.set()
+    assert await asyncio.gather(*waiters) == ['result'] * 5
+    assert len(calls) == 1
+    assert len(flight) == 0
+
+    # Once finished, the next caller starts a new call
+    assert await flight.do('key', lookup) == 'result'
+    assert len(calls) == 2
+
+
+async def test_errors_reach_every_waiter() -> None:
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def lookup() -> str:
+        await release.wait()
+        raise LookupError('unavailable')
+
+    waiters = [asyncio.create_task(flight.do('key', lookup)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert [type(result) for result in results] == [LookupError] * 3
+    assert len(flight) == 0
+
+
+async def test_a_waiter_takes_over_when_the_caller_is_cancelled() -> None:
+    flight = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def lookup() -> int:
+        calls.append(True)
+        await release.wait()
+        return len(calls)
+
+    leader = asyncio.create_task(flight.do('key', lookup))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do('key', lookup))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await follower == 2
+    assert leader.cancelled()
@@ -0,0 +1,42 @@
+import pytest
+
+from src.utils.suggest_index import SuggestIndex
+
+NAMES = ['Capital One', 'Sapphire Preferred', 'Sapphire Reserve', 'Platinum Card', 'Gold Card', 'Freedom Unlimited']
+
+
+@pytest.fixture
+def index() -> SuggestIndex:
+    index = SuggestIndex(max_distance=1)
+    for name in NAMES:
+        index.add(name, name)
+    return index
+
+
+@pytest.mark.parametrize(
+    ('query', 'expected'),
+    [
+        ('capital', ['Capital One']),
+        ('capitol', ['Capital One']),
+        # Typed text past the end of a word is not dropped, however long the word's indexed prefix
+        ('capitalize', []),
+        ('capitalx', ['Capital One']),
+        ('sapphire', ['Sapphire Reserve', 'Sapphire Preferred']),
+        ('saphire', ['Sapphire Reserve', 'Sapphire Preferred']),
+        ('sapphirx res', ['Sapphire Reserve']),
+        ('sapphire reservedx', []),
+        ('freedom unlimted', ['Freedom Unlimited']),
+        ('platnum', ['Platinum Card']),
+        ('gol', ['Gold Card']),
+        # Words of three letters or less must match exactly
+        ('gpl', []),
+        ('card', ['Gold Card', 'Platinum Card']),
+    ],
+)
+def test_suggestions_tolerate_one_typo_per_word(index: SuggestIndex, query: str, expected: list[str]) -> None:
+    assert [name for _, name in index.suggest(query, 10)] == expected
+
+
+def test_removed_names_are_not_suggested(index: SuggestIndex) -> None:
+    index.remove('Gold Card')
+    assert [name for _, name in index.suggest('card', 10)] == ['Platinum Card']